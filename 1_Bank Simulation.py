@@ -1,93 +1,37 @@
-import math
-import pandas as pd
-import numpy as np
 import streamlit as st
 import os
 
 # Import functions from your `fig_func` module
 # Replace with actual imports or implementations
 from modules.fig_func import (
-    plot_gantt_chart, entVsWT, entVsTA, entVsArrival, entVsService, ServerUtilization, calculate_server_utilization
+    plot_gantt_chart, entVsWT, entVsTA, entVsArrival, entVsService, ServerUtilization, calculate_server_utilization,
+    show_timeline, show_percentiles, gantt_window, long_run_controls, show_long_run_summary, start_job, show_job
 )
-
-# Function to calculate cumulative probability
-def calculate_CP(x, lambda_rate, prev_cp):
-    return prev_cp + (math.exp(-lambda_rate) * (lambda_rate ** x) / math.factorial(x))
-
-# Function to calculate service time
-def calculate_service_time(mu_rate):
-    return math.ceil(-mu_rate * np.log(np.random.rand()))
-
-# Main M/M/n simulation function
-def mmn(lambda_rate, mu_rate, num_entries, num_servers):
-    service_times = []
-    cp_values = []
-    inter_arrival_times = [0]
-    arrival_times = [0]
-    turn_around_times = []
-    wait_times = []
-    response_times = []
-
-    prev_cp = 0
-    customers = [f"{i}" for i in range(num_entries)]
-
-    for i in range(num_entries):
-        cp = calculate_CP(i, lambda_rate, prev_cp)
-        prev_cp = cp
-        cp_values.append(cp)
-        service_times.append(calculate_service_time(mu_rate))
-
+from modules.sampling import poisson_cp_table
+from modules.engine import as_frame
+from modules.result_store import cached_simulation
+from modules.dataset import DATA_PATH, load_bank_data
+from modules.replay import INTER_ARRIVAL_COLUMN, SERVICE_COLUMN, replay
+from modules.jobs import submit_long_run
+
+# Customers of a run shown with every chart, as many as the longest table of the other simulation pages;
+# longer runs go to the background as a long-run simulation
+MAX_CHARTED_CUSTOMERS = 500
+
+# Main M/M/n simulation function; seeded runs are served from the result store when simulated before
+def mmn(lambda_rate, mu_rate, num_entries, num_servers, seed):
+    # Cumulative probabilities (cached per arrival rate and table size)
+    cp_values = list(poisson_cp_table(lambda_rate, num_entries=num_entries))
     cp_values.append(1)  # Ensure cumulative probability ends at 1
     labels = [f"{0.0000}-{cp_values[0]:.4f}"] + [
         f"{cp_values[i]:.4f}-{cp_values[i + 1]:.4f}" for i in range(len(cp_values) - 1)
     ]
 
-    df = pd.DataFrame({"Customer": customers, "Cumulative Probability": cp_values[0:num_entries]})
-    df['I.A Range'] = labels[0:num_entries]
-
-    arrival = 0
-    for i in range(num_entries - 1):
-        random = np.random.random()
-        for j in range(len(df['Cumulative Probability'])):
-            if random < df['Cumulative Probability'][j]:
-                inter_arrival_times.append(j)
-                arrival += j
-                arrival_times.append(arrival)
-                break
-
-    df["Inter Arrival Time"] = inter_arrival_times
-    df["Arrival Time"] = arrival_times
-    df["Service Time"] = service_times
-
-    # Assign servers and calculate times
-    servers = [0] * num_servers
-    start_times = []
-
-    for i in range(len(df)):
-        server = servers.index(min(servers))
-        assigned_start_time = max(df.loc[i, "Arrival Time"], servers[server])
-        servers[server] = assigned_start_time + df.loc[i, "Service Time"]
-
-        df.loc[i, "Server"] = server
-        start_times.append(assigned_start_time)
-
-    df["Start Time"] = start_times
-    df["End Time"] = df["Start Time"] + df["Service Time"]
-
-    # Calculate performance metrics
-    for i, row in df.iterrows():
-        turn_around = row["End Time"] - row["Arrival Time"]
-        wait = turn_around - row["Service Time"]
-        response = row["Start Time"] - row["Arrival Time"]
-
-        turn_around_times.append(turn_around)
-        wait_times.append(wait)
-        response_times.append(response)
-
-    df["Turn Around Time"] = turn_around_times
-    df["Response Time"] = response_times
-    df["Wait Time"] = wait_times
-
+    # Inter-arrival, arrival and service times from the seeded generator, dispatched to the servers
+    columns = cached_simulation("mms", {"lambda_rate": lambda_rate, "mu_rate": mu_rate}, num_servers, num_entries, seed)
+    df = as_frame(columns)
+    df.insert(1, "Cumulative Probability", cp_values[0:num_entries])
+    df.insert(2, "I.A Range", labels[0:num_entries])
     return df
 
 # Streamlit application
@@ -95,61 +39,125 @@ st.title("Simulation Of Bank Data")
 
 # Load data
 try:
-    data_path = "./data/Goodness Of Fit Test(ChiSquare).xlsx"
-    if not os.path.exists(data_path):
-        st.error("Data file not found. Please ensure the file exists at './data/Goodness Of Fit Test(ChiSquare).xlsx'.")
+    if not os.path.exists(DATA_PATH):
+        st.error(f"Data file not found. Please ensure the file exists at '{DATA_PATH}'.")
     else:
-        data = pd.read_excel(data_path, sheet_name="Sheet1")
+        data = load_bank_data()
         st.success("Data loaded successfully.")
 
-        # Calculate lambda and mu rates
-        if len(data["INTER-ARRIVAL TIME(MIN)"].dropna()) > 90 and len(data["SERVICE TIME (MIN)"].dropna()) > 90:
-            lambda_rate = 1 / data["INTER-ARRIVAL TIME(MIN)"].dropna().iloc[90]
-            mu_rate = 1 / data["SERVICE TIME (MIN)"].dropna().iloc[90]
-        else:
-            st.error("Insufficient data to calculate λ and μ. Ensure at least 91 rows in the dataset.")
+        # Calculate lambda and mu rates from the MEAN= row of the workbook
+        tests = data["tests"]
+        lambda_rate = 1 / tests.loc["Inter-Arrival", "MEAN"]
+        mu_rate = 1 / tests.loc["Service", "MEAN"]
 except Exception as e:
     st.error(f"An error occurred while loading data: {str(e)}")
 
-# Simulation
-if st.button("Generate Simulation"):
-    try:
-        df = mmn(lambda_rate, mu_rate, num_entries=90, num_servers=3)
-        st.write("### Simulation Results")
-        # st.dataframe(df, hide_index=True)
+# Function to show the averages and charts of a simulated or replayed run
+def show_results(df, num_servers, key):
+    # Calculate averages
+    avg_interarrival = df["Inter Arrival Time"].mean()
+    avg_service = df["Service Time"].mean()
+    avg_TA = df["Turn Around Time"].mean()
+    avg_WT = df["Wait Time"].mean()
+    avg_RT = df["Response Time"].mean()
+
+    st.write(f"**Average Inter-Arrival Time**: {avg_interarrival:.2f}")
+    st.write(f"**Average Service Time**: {avg_service:.2f}")
+    st.write(f"**Average Turn-Around Time**: {avg_TA:.2f}")
+    st.write(f"**Average Wait Time**: {avg_WT:.2f}")
+    st.write(f"**Average Response Time**: {avg_RT:.2f}")
+
+    st.write("### Percentiles")
+    show_percentiles(df)
 
-        # Calculate averages
-        avg_interarrival = df["Inter Arrival Time"].mean()
-        avg_service = df["Service Time"].mean()
-        avg_TA = df["Turn Around Time"].mean()
-        avg_WT = df["Wait Time"].mean()
-        avg_RT = df["Response Time"].mean()
+    # Plots and charts
+    st.write("### Gantt Chart for Servers")
+    plot_gantt_chart(df, num_servers=num_servers, window=gantt_window(df, f"{key}_gantt_window"))
 
-        st.write(f"**Average Inter-Arrival Time**: {avg_interarrival:.2f}")
-        st.write(f"**Average Service Time**: {avg_service:.2f}")
-        st.write(f"**Average Turn-Around Time**: {avg_TA:.2f}")
-        st.write(f"**Average Wait Time**: {avg_WT:.2f}")
-        st.write(f"**Average Response Time**: {avg_RT:.2f}")
+    st.write("### Wait Time vs Customers")
+    entVsWT(df["Customer"], df["Wait Time"])
 
-        # Plots and charts
-        st.write("### Gantt Chart for Servers")
-        plot_gantt_chart(df,num_servers=3)
+    st.write("### Turnaround Time vs Customers")
+    entVsTA(df["Customer"], df["Turn Around Time"])
 
-        st.write("### Wait Time vs Customers")
-        entVsWT(df["Customer"], df["Wait Time"])
+    st.write("### Arrival Time vs Customers")
+    entVsArrival(df["Customer"], df["Arrival Time"])
 
-        st.write("### Turnaround Time vs Customers")
-        entVsTA(df["Customer"], df["Turn Around Time"])
+    st.write("### Service Time vs Customers")
+    entVsService(df["Customer"], df["Service Time"])
 
-        st.write("### Arrival Time vs Customers")
-        entVsArrival(df["Customer"], df["Arrival Time"])
+    st.write("### Queue Length and Server Occupancy Over Time")
+    show_timeline(df, num_servers)
 
-        st.write("### Service Time vs Customers")
-        entVsService(df["Customer"], df["Service Time"])
+    st.write("### Server Utilization")
+    server_util = calculate_server_utilization(df, num_servers)
+    for server_no, utilization in enumerate(server_util.values(), start=1):
+        ServerUtilization(utilization, server_no=server_no)
 
-        st.write("### Server Utilization")
-        server_util = calculate_server_utilization(df)
-        for server, utilization in server_util.items():
-            ServerUtilization(utilization)
+
+# Simulation (the seed stays in session state, so the results stay on screen while the Gantt window is moved)
+simulation_seed = st.number_input("Simulation seed", min_value=0, value=12345, step=1, key="bank_simulation_seed")
+if st.button("Generate Simulation"):
+    st.session_state["bank_simulation"] = simulation_seed
+if st.session_state.get("bank_simulation") == simulation_seed:
+    try:
+        df = mmn(lambda_rate, mu_rate, num_entries=90, num_servers=3, seed=simulation_seed)
+        st.write("### Simulation Results")
+        # st.dataframe(df, hide_index=True)
+        show_results(df, num_servers=3, key="bank_simulation")
+    except Exception as e:
+        st.error(f"An error occurred during the simulation: {str(e)}")
+
+
+# Replay of the recorded customers: the logged arrivals and service times, served by a chosen number of servers
+st.write("### Replay Recorded Data")
+replay_servers = st.number_input("Number of servers (what if we had s servers)", min_value=1, max_value=50, value=3, step=1)
+if st.button("Replay Recorded Data"):
+    st.session_state["bank_replay"] = replay_servers
+if st.session_state.get("bank_replay") == replay_servers:
+    try:
+        customers = data["customers"]
+        df = as_frame(replay(customers[INTER_ARRIVAL_COLUMN], customers[SERVICE_COLUMN], replay_servers))
+        st.write("### Replay Results")
+        st.dataframe(df, hide_index=True)
+        show_results(df, num_servers=replay_servers, key="bank_replay")
+    except Exception as e:
+        st.error(f"An error occurred during the replay: {str(e)}")
+
+
+# Function to give the empirical model the recorded inter-arrival and service times
+def empirical_params():
+    customers = data["customers"]
+    return {
+        "inter_arrival_values": customers[INTER_ARRIVAL_COLUMN].to_numpy(),
+        "service_values": customers[SERVICE_COLUMN].to_numpy(),
+    }
+
+
+# Simulation that draws inter-arrival and service times from the recorded data's own distributions
+st.write("### Simulation from the Recorded Distributions")
+empirical_customers = st.number_input("Number of customers", min_value=10, max_value=MAX_CHARTED_CUSTOMERS, value=100, step=10)
+empirical_servers = st.number_input("Number of servers", min_value=1, max_value=50, value=3, step=1)
+empirical_seed = st.number_input("Simulation seed", min_value=0, value=12345, step=1)
+empirical_workload = (empirical_customers, empirical_servers, empirical_seed)
+if st.button("Simulate From Recorded Distributions"):
+    st.session_state["bank_empirical"] = empirical_workload
+if st.session_state.get("bank_empirical") == empirical_workload:
+    try:
+        df = as_frame(cached_simulation("empirical", empirical_params(), empirical_servers, empirical_customers, empirical_seed))
+        st.write("### Simulation Results")
+        st.dataframe(df, hide_index=True)
+        show_results(df, num_servers=empirical_servers, key="bank_empirical")
+    except Exception as e:
+        st.error(f"An error occurred during the simulation: {str(e)}")
+
+st.write("#### Long-Run Simulation from the Recorded Distributions")
+num_customers, horizon = long_run_controls()
+if st.button("Run Long Simulation"):
+    try:
+        job = submit_long_run("empirical", empirical_params(), empirical_servers,
+                              num_customers=num_customers, horizon=horizon, seed=empirical_seed)
+        start_job("empirical_long_run", job)
     except Exception as e:
         st.error(f"An error occurred during the simulation: {str(e)}")
+show_job("empirical_long_run", show_long_run_summary)
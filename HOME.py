@@ -1,6 +1,6 @@
-import numpy as np
 import streamlit as st
-import pandas as pd
+from modules.dataset import TESTS, load_bank_data
+from modules.fitting import best_fit, histogram
 
 
 st.set_page_config(
@@ -19,62 +19,52 @@ st.write("4. Saad Sami Khan B2110006108")
 st.write(" ")
 st.title("1-Data")
 
-df = pd.read_excel("./data/Goodness Of Fit Test(ChiSquare).xlsx")
+data = load_bank_data()
+tests = data["tests"]
 
-# Fill missing values with "-"
-df.fillna("-", inplace=True)
+# Customer table from the workbook
+st.dataframe(data["customers"], width=1000, height=300, hide_index=True)
 
 
-data = df.iloc[:90]  # Use .iloc[:94] for integer-based indexing
+# Function to show one goodness-of-fit block with its test statistics
+def show_chi_square(block, test):
+    st.dataframe(block, hide_index=True)
+    st.write(f"**Observed Total**: {block['OBS. FREQ'].sum()}  |  **Chi-Square Sum**: {block['CHI-SQUARE'].sum():.6f}")
+    st.write(f"**df** = {tests.loc[test, 'DF']}  |  **X²tab** = {tests.loc[test, 'X^2TAB']}  |  **X²cal** = {tests.loc[test, 'X^2CAL']:.6f}")
+    st.markdown(f'<p style="color:green;">{tests.loc[test, "CONCLUSION"]}</p>', unsafe_allow_html=True)
 
-# Extract specific columns by their names
-columns_to_display = [
-    "CUSTOMER", 
-    "ARRIVAL TIME ", 
-    "SERVICE TIME(START)", 
-    "SERVICE TIME(END)", 
-    "INTER-ARRIVAL TIME(MIN)", 
-    "SERVICE TIME (MIN)"
-]
-
-# Filter the DataFrame to include only the specified columns
-filtered_data = data[columns_to_display]
-
-# Display the filtered DataFrame in Streamlit without an index
-# st.dataframe(filtered_data, hide_index=True)
-st.dataframe(filtered_data, width=1000, height=300, hide_index=True)
 
 st.title("2-Chi square test")
 st.subheader("i)GOODNESS OF FITNESS INTER-ARRIVAL")
-header = df.iloc[94]  # This is the row you want to set as the header
-
-
-# Create a new DataFrame with the row as the column names
-IA_chiSquare = df.iloc[95:104].fillna("-")  # Data starting from row 95 to 104
-IA_chiSquare.columns = header  # Set the extracted row as column names
-
-# Display the updated DataFrame
-# st.dataframe(IA_chiSquare)
-st.dataframe(IA_chiSquare, hide_index=True)
-st.markdown('<p style="color:green;">Ho is accepted: Inter arrival time for this data is in poisson distribution</p>', unsafe_allow_html=True)
+show_chi_square(data["inter_arrival_chi_square"], "Inter-Arrival")
 
 st.subheader("ii)GOODNESS OF FITNESS SERVICE")
-Sheader = df.iloc[106]  # This is the row you want to set as the header
-
-# Create a new DataFrame with the row as the column names
-S_chiSquare = df.iloc[107:120].fillna(" ")  # Data starting from row 95 to 104
-S_chiSquare.columns = header  # Set the extracted row as column names
-
-# Display the updated DataFrame
-st.dataframe(S_chiSquare,hide_index=True)
-
-st.markdown('<p style="color:green;">Ho is accepted:Service time for this data is in exponential distribution</p>', unsafe_allow_html=True)
-
-
-
-
-
-
-
-
-
+show_chi_square(data["service_chi_square"], "Service")
+
+
+# Function to fit the candidate distributions to one data column, cached so reruns skip scipy
+@st.cache_data(show_spinner=False)
+def column_fits(values):
+    return best_fit(histogram(values))
+
+
+# Function to show the candidate distributions fitted to one data column, best first, with the best one's table
+def show_fits(column):
+    fits = column_fits(data["customers"][column].to_numpy())
+    st.dataframe({
+        "Distribution": [fit["Distribution"] for fit in fits],
+        "Parameters": [", ".join(f"{name}={value:.4g}" for name, value in fit["Parameters"].items()) for fit in fits],
+        "Chi-Square": [fit["Chi-Square"] for fit in fits],
+        "df": [fit["DF"] for fit in fits],
+        "Chi-Square p-value": [fit["Chi-Square p-value"] for fit in fits],
+        "KS": [fit["KS"] for fit in fits],
+        "KS p-value": [fit["KS p-value"] for fit in fits],
+    }, hide_index=True)
+    st.write(f"**Best fit**: {fits[0]['Distribution']}")
+    st.dataframe(fits[0]["Table"], hide_index=True)
+
+
+st.title("3-Distribution fitting")
+for number, (test, (_, column)) in zip(["i", "ii"], TESTS.items()):
+    st.subheader(f"{number}){test.upper()} TIME")
+    show_fits(column)
@@ -0,0 +1,143 @@
+"""Benchmark the simulation engines and cross-check them against the analytic M/M/S formulas.
+
+Run from the repository root:
+
+    python benchmarks/bench_engines.py
+    python benchmarks/bench_engines.py --sizes 1000 100000 --servers 1 10 --models mms --stream
+    python benchmarks/bench_engines.py --skip-timing --output bench_output.txt
+"""
+import argparse
+import hashlib
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.dispatch import dispatch, queue_metrics  # noqa: E402
+from modules.engine import simulate  # noqa: E402
+from modules.queuing import mms_metrics  # noqa: E402
+from modules.streaming import stream_simulation  # noqa: E402
+
+SIZES = [10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+SERVERS = [1, 3, 10, 100]
+MODELS = ["mms", "ggs", "mgs"]
+SEED = 2024
+
+
+# Function to choose model parameters that keep each server about 80% busy
+def benchmark_params(model, num_servers):
+    if model == "mms":
+        return {"lambda_rate": 2.0, "mu_rate": 1.6 * num_servers - 0.5}
+    if model == "mgs":
+        mean_service = 1.2 * num_servers - 0.5
+        return {"lembda": 1.5, "meu_min": mean_service, "meu_max": mean_service}
+    return {"lembda": 1.5, "meu": 5.0, "sigma": 7.0}  # G/G/S ties both streams to meu: the page defaults
+
+
+# Function to time one engine run and measure its peak traced memory in a second run.
+# An untimed warm-up run first loads the lazily imported modules and fills the table caches.
+def measure(run, repeat):
+    run()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        output = run()
+        timings.append(time.perf_counter() - started)
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return min(timings), peak, output
+
+
+# Function to fingerprint an engine's output, so a change in results shows up as a changed digest
+def digest(columns):
+    hasher = hashlib.sha1()
+    for name in ["Server", "Start Time", "End Time"]:
+        hasher.update(np.ascontiguousarray(columns[name]).tobytes())
+    return hasher.hexdigest()[:12]
+
+
+def run_timing(args, write):
+    write(f"{'model':<6}{'mode':<8}{'servers':>8}{'customers':>12}{'seconds':>10}{'customers/s':>14}{'peak MB':>10}  digest")
+    for model in args.models:
+        for num_servers in args.servers:
+            params = benchmark_params(model, num_servers)
+            for size in args.sizes:
+                runs = [("batch", lambda: simulate(model, params, num_servers, size, np.random.default_rng(SEED)))]
+                if args.stream:
+                    runs.append(("stream", lambda: stream_simulation(model, params, num_servers, num_customers=size,
+                                                                     rng=np.random.default_rng(SEED))))
+                for mode, run in runs:
+                    seconds, peak, output = measure(run, args.repeat)
+                    fingerprint = digest(output) if mode == "batch" else "-"
+                    write(f"{model:<6}{mode:<8}{num_servers:>8}{size:>12,}{seconds:>10.3f}"
+                          f"{size / seconds:>14,.0f}{peak / 2 ** 20:>10.1f}  {fingerprint}")
+
+
+# Function to estimate a long-run mean and its confidence half-width with batch means (after a warm-up)
+def batch_means(values, batches=20, warmup=0.1):
+    values = values[int(len(values) * warmup):]
+    size = len(values) // batches
+    means = values[:size * batches].reshape(batches, size).mean(axis=1)
+    return means.mean(), 2.861 * means.std(ddof=1) / np.sqrt(batches)  # t(0.995, 19 df): a 99% interval
+
+
+# Function to check the dispatch engine's long-run Wq and W against the closed-form M/M/S results
+def run_check(args, write):
+    write("")
+    write(f"{'servers':>8}{'rho':>6}{'metric':>8}{'analytic':>12}{'simulated':>12}{'half-width':>12}  result")
+    rng = np.random.default_rng(SEED)
+    failures = 0
+    for num_servers in [1, 3, 10]:
+        arrival_rate, service_rate = 0.8 * num_servers, 1.0
+        arrival = np.cumsum(rng.exponential(1 / arrival_rate, args.check_customers))
+        service = rng.exponential(1 / service_rate, args.check_customers)
+        _, start, end = dispatch(arrival, service, num_servers)
+        turn_around, wait, _ = queue_metrics(arrival, service, start, end)
+        analytic = mms_metrics(arrival_rate, service_rate, num_servers)[0]
+
+        for metric, values, expected in [("Wq", wait, analytic.Wq), ("W", turn_around, analytic.W)]:
+            mean, half_width = batch_means(values)
+            # Allow 1% on top of the sampling error for the bias left after the warm-up
+            passed = abs(mean - expected) <= half_width + 0.01 * expected
+            failures += not passed
+            write(f"{num_servers:>8}{0.8:>6.2f}{metric:>8}{expected:>12.4f}{mean:>12.4f}{half_width:>12.4f}  "
+                  f"{'ok' if passed else 'FAIL'}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the M/M/S, G/G/S and M/G/S simulation engines.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="numbers of customers to simulate")
+    parser.add_argument("--servers", type=int, nargs="+", default=SERVERS, help="server counts to simulate")
+    parser.add_argument("--models", nargs="+", choices=MODELS, default=MODELS)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case (the fastest is reported)")
+    parser.add_argument("--stream", action="store_true", help="also time the streaming (constant-memory) mode")
+    parser.add_argument("--check-customers", type=int, default=10 ** 6, help="customers per analytic cross-check")
+    parser.add_argument("--skip-timing", action="store_true")
+    parser.add_argument("--skip-check", action="store_true")
+    parser.add_argument("--output", help="also write the report to this file")
+    args = parser.parse_args()
+
+    lines = []
+
+    def write(line):
+        print(line, flush=True)
+        lines.append(line)
+
+    if not args.skip_timing:
+        run_timing(args, write)
+    failures = 0 if args.skip_check else run_check(args, write)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write("\n".join(lines) + "\n")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
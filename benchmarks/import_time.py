@@ -0,0 +1,69 @@
+"""Measure the cold import time of every page, i.e. what a new session pays before the page can render.
+
+Each page's top-level imports are run in a fresh interpreter; the report also lists which of the
+heavy packages they pulled in. Run from the repository root:
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --repeat 5 --output import_times.txt
+"""
+import argparse
+import ast
+import glob
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_PACKAGES = ["pandas", "scipy", "matplotlib", "pyarrow"]
+
+# Script run in the fresh interpreter: time the imports, then report the heavy packages that got loaded
+PROBE = """
+import sys, time
+started = time.perf_counter()
+{imports}
+elapsed = time.perf_counter() - started
+print(elapsed, ",".join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+
+# Function to collect the top-level import statements of a page
+def page_imports(path):
+    with open(path, encoding="utf-8") as file:
+        tree = ast.parse(file.read())
+    return "\n".join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+# Function to time a page's imports in fresh interpreters and keep the median
+def measure(path, repeat):
+    code = PROBE.format(imports=page_imports(path), heavy=HEAVY_PACKAGES)
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True,
+                                capture_output=True, text=True).stdout.split()
+        timings.append(float(output[0]))
+    return statistics.median(timings), output[1] if len(output) > 1 else "-"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the cold import time of every Streamlit page.")
+    parser.add_argument("--repeat", type=int, default=3, help="fresh interpreters per page (the median is reported)")
+    parser.add_argument("--output", help="also write the report to this file")
+    args = parser.parse_args()
+
+    pages = [os.path.join(ROOT, "HOME.py"), os.path.join(ROOT, "1_Bank Simulation.py")]
+    pages += sorted(glob.glob(os.path.join(ROOT, "pages", "*.py")))
+
+    lines = [f"{'page':<32}{'seconds':>9}  heavy packages loaded"]
+    print(lines[0], flush=True)
+    for path in pages:
+        seconds, heavy = measure(path, args.repeat)
+        lines.append(f"{os.path.basename(path):<32}{seconds:>9.3f}  {heavy}")
+        print(lines[-1], flush=True)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write("\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,87 @@
+import argparse
 import subprocess
 import sys
 
 app_path = "./HOME.py"  # Replace with the correct path to your app.py
 
-# Run the Streamlit app using subprocess
-try:
-    print("Opening Streamlit app...")
-    input("Press Enter To Continue...")  # Pausing to allow user to continue
-    result = subprocess.run([sys.executable, "-m", "streamlit", "run", app_path], 
-                            check=True, capture_output=True, text=True)
-    # If the subprocess completes without error, print the standard output
-    print(result.stdout)
-
-except subprocess.CalledProcessError as e:
-    # In case of an error, capture stderr and print it
-    print("Error encountered while running Streamlit app:")
-    print(e.stderr)
+
+# Function to open the Streamlit app, letting its output reach the terminal as it happens
+def run_app():
+    try:
+        print("Opening Streamlit app...")
+        input("Press Enter To Continue...")  # Pausing to allow user to continue
+        subprocess.run([sys.executable, "-m", "streamlit", "run", app_path], check=True)
+
+    except subprocess.CalledProcessError as e:
+        print(f"Error encountered while running Streamlit app (exit code {e.returncode}).")
+
+
+# Function to run a scenario file headlessly (no Streamlit or matplotlib is imported)
+def run_batch_file(args):
+    from modules.batch import load_scenarios, run_batch
+    from modules.result_store import RESULTS_DIR
+
+    scenarios = load_scenarios(args.scenarios)
+    print(f"Running {len(scenarios)} scenario(s)...")
+    cache_dir = None if args.no_cache else (args.cache_dir or RESULTS_DIR)
+    results = run_batch(scenarios, args.output, base_seed=args.seed, details=args.details, max_workers=args.workers,
+                        cache_dir=cache_dir)
+    print(results.to_string(index=False))
+    print(f"Results written to {args.output}")
+
+
+# Function to fit the candidate distributions to one column of a (possibly very large) CSV/Parquet log
+def run_fit(args):
+    from modules.fitting import best_fit, histogram_from_file
+
+    hist = histogram_from_file(args.log, args.column, bin_width=args.bin_width)
+    print(f"{hist.stats.count:,} values, mean {hist.stats.mean:.4f}, std. dev. {hist.stats.std:.4f}")
+    for fit in best_fit(hist):
+        params = ", ".join(f"{name}={value:.4g}" for name, value in fit["Parameters"].items())
+        print(f"{fit['Distribution']:<12} {params:<28} chi-square {fit['Chi-Square']:.4f} (df {fit['DF']}, "
+              f"p {fit['Chi-Square p-value']:.4f})  KS {fit['KS']:.4f} (p {fit['KS p-value']:.4f})")
+
+
+# Function to replay a recorded log through a chosen number of servers, reading it in chunks
+def run_replay(args):
+    from modules.replay import replay_file
+
+    summary = replay_file(args.log, args.servers, args.inter_arrival_column, args.service_column)
+    print(f"{summary['Customers']:,} customers replayed on {args.servers} server(s) over {summary['Elapsed Time']:,.2f} minutes")
+    for metric, stats in summary["Stats"].items():
+        print(f"Average {metric}: {stats.mean:.4f} (std. dev. {stats.std:.4f})")
+    for metric, sketch in summary["Sketches"].items():
+        print(f"{metric} percentiles: " + ", ".join(f"P{p} {value:.4f}" for p, value in sketch.percentiles().items()))
+    print(f"Overall Utilization: {summary['Overall Utilization']:.2%}")
+
+
+parser = argparse.ArgumentParser(description="Queuing simulator: opens the app, or runs scenario files headlessly.")
+commands = parser.add_subparsers(dest="command")
+batch = commands.add_parser("batch", help="run the scenarios of a CSV/JSON file and write the results as Parquet")
+batch.add_argument("scenarios", help="file with model, servers, customers, optional seed and the model's parameters")
+batch.add_argument("-o", "--output", default="./batch_results", help="directory for summary.parquet")
+batch.add_argument("--seed", type=int, default=0, help="batch seed for rows without their own seed")
+batch.add_argument("--details", action="store_true", help="also write each scenario's per-customer results")
+batch.add_argument("--workers", type=int, default=None, help="number of worker processes (default: all cores)")
+batch.add_argument("--cache-dir", default=None, help="result store to reuse and fill (default: the repository's data/.cache/results)")
+batch.add_argument("--no-cache", action="store_true", help="neither reuse nor store per-scenario results")
+fit = commands.add_parser("fit", help="fit Poisson, exponential, normal and uniform distributions to a logged column")
+fit.add_argument("log", help="CSV or Parquet file, read in chunks")
+fit.add_argument("--column", required=True, help="column holding the times to fit")
+fit.add_argument("--bin-width", type=float, default=1.0, help="histogram bin width (default: 1 minute)")
+replay = commands.add_parser("replay", help="replay recorded arrivals and service times through s servers")
+replay.add_argument("log", help="CSV or Parquet file, read in chunks")
+replay.add_argument("--servers", type=int, required=True, help="number of servers to replay the log with")
+replay.add_argument("--inter-arrival-column", default="INTER-ARRIVAL TIME(MIN)")
+replay.add_argument("--service-column", default="SERVICE TIME (MIN)")
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    if args.command == "batch":
+        run_batch_file(args)
+    elif args.command == "fit":
+        run_fit(args)
+    elif args.command == "replay":
+        run_replay(args)
+    else:
+        run_app()
@@ -0,0 +1,87 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from modules.models import MODEL_PARAMS
+from modules.quantiles import PERCENTILE_METRICS, exact_percentiles
+from modules.result_store import RESULTS_DIR, cached_simulation
+from modules.streaming import STREAM_METRICS
+
+# Columns every scenario row needs besides its model parameters
+SCENARIO_COLUMNS = ["model", "servers", "customers"]
+
+
+# Function to read scenario rows from a CSV file or a JSON list of objects
+def load_scenarios(path):
+    if path.lower().endswith(".json"):
+        with open(path) as file:
+            rows = json.load(file)
+        scenarios = pd.DataFrame(rows.get("scenarios", []) if isinstance(rows, dict) else rows)
+    else:
+        scenarios = pd.read_csv(path)
+    scenarios.columns = [str(column).strip() for column in scenarios.columns]
+
+    missing = [column for column in SCENARIO_COLUMNS if column not in scenarios.columns]
+    if missing:
+        raise ValueError(f"Scenario file is missing the column(s): {', '.join(missing)}")
+    scenarios["model"] = scenarios["model"].str.strip().str.lower()
+    unknown = sorted(set(scenarios["model"]) - set(MODEL_PARAMS))
+    if unknown:
+        raise ValueError(f"Unknown model(s) {', '.join(unknown)}; use one of {', '.join(MODEL_PARAMS)}")
+    scenarios = scenarios.reset_index(drop=True)
+    for column in ["servers", "customers"]:
+        values = pd.to_numeric(scenarios[column], errors="coerce")
+        invalid = values.isna() | (values < 1) | (values % 1 != 0)
+        if invalid.any():
+            index = int(invalid.idxmax())
+            raise ValueError(f"Scenario {index} ({scenarios.at[index, 'model']}) has {column}="
+                             f"{scenarios.at[index, column]}; it must be a whole number of at least 1")
+    return scenarios
+
+
+# Function to turn one scenario row into the arguments of a simulation run.
+# Rows without a seed get one derived from the batch seed and their position, so reruns repeat.
+def scenario_arguments(row, index, base_seed=0):
+    missing = [name for name in MODEL_PARAMS[row["model"]] if pd.isna(row.get(name))]
+    if missing:
+        raise ValueError(f"Scenario {index} ({row['model']}) is missing the parameter(s): {', '.join(missing)}")
+    params = {name: float(row[name]) for name in MODEL_PARAMS[row["model"]]}
+    seed = row.get("seed")
+    if pd.isna(seed):
+        seed = np.random.SeedSequence([base_seed, index]).generate_state(1)[0]
+    return row["model"], params, int(row["servers"]), int(row["customers"]), int(seed)
+
+
+# Function to run one scenario and reduce it to a summary row (plus its per-customer columns when asked).
+# Results are reused from and stored in cache_dir; cache_dir=None keeps the run off the disk.
+def run_scenario(model, params, num_servers, num_customers, seed, details=False, cache_dir=RESULTS_DIR):
+    columns = cached_simulation(model, params, num_servers, num_customers, seed, cache_dir)
+    elapsed = float(columns["End Time"].max())
+    busy_time = np.bincount(columns["Server"], weights=columns["Service Time"], minlength=num_servers)
+
+    summary = {"seed": seed, "Elapsed Time": elapsed}
+    summary.update({f"Average {metric}": float(columns[metric].mean()) for metric in STREAM_METRICS})
+    for metric in PERCENTILE_METRICS:
+        summary.update({f"P{p} {metric}": value for p, value in exact_percentiles(columns[metric]).items()})
+    summary["Overall Utilization"] = float(busy_time.mean() / elapsed) if elapsed else 0.0
+    return summary, (columns if details else None)
+
+
+# Function to run every scenario in parallel and write the summary (and optional per-customer results) as Parquet
+def run_batch(scenarios, output_dir, base_seed=0, details=False, max_workers=None, cache_dir=RESULTS_DIR):
+    arguments = [scenario_arguments(row, index, base_seed) for index, row in scenarios.iterrows()]
+    os.makedirs(output_dir, exist_ok=True)
+
+    summaries = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(run_scenario, *args, details=details, cache_dir=cache_dir) for args in arguments]
+        for index, future in enumerate(futures):
+            summary, columns = future.result()
+            summaries.append(summary)
+            if columns is not None:
+                pd.DataFrame(columns).to_parquet(os.path.join(output_dir, f"scenario_{index}.parquet"), index=False)
+
+    results = pd.concat([scenarios.drop(columns="seed", errors="ignore"), pd.DataFrame(summaries)], axis=1)
+    results.to_parquet(os.path.join(output_dir, "summary.parquet"), index=False)
+    return results
@@ -0,0 +1,24 @@
+import os
+import tempfile
+
+
+# Function to write a file through a temporary file in the same directory, so readers never see a partial file.
+# Every write gets its own temporary file, so writers of the same path at once cannot mix their output.
+def write_atomic(path, write):
+    handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=f"{os.path.basename(path)}.",
+                                         suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as file:
+            write(file)
+        os.replace(temp_path, path)
+    except BaseException:
+        remove_file(temp_path)
+        raise
+
+
+# Function to delete a file if it is still there
+def remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
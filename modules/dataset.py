@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+import pandas as pd
+from modules.cache_files import write_atomic
+
+DATA_PATH = "./data/Goodness Of Fit Test(ChiSquare).xlsx"
+CACHE_DIR = "./data/.cache"
+
+# Customer table columns and the types they are stored with
+CUSTOMER_COLUMNS = {
+    "CUSTOMER": "int64",
+    "ARRIVAL TIME": "object",
+    "SERVICE TIME(START)": "object",
+    "SERVICE TIME(END)": "object",
+    "INTER-ARRIVAL TIME(MIN)": "int64",
+    "SERVICE TIME (MIN)": "int64",
+}
+
+# Chi-square block columns and the types they are stored with
+CHI_SQUARE_COLUMNS = {
+    "BINS": "object",
+    "OBS. FREQ": "int64",
+    "LOWER": "int64",
+    "UPPER": "int64",
+    "LBP": "float64",
+    "UBP": "float64",
+    "UBP-LBP": "float64",
+    "EXP. FREQ": "float64",
+    "CHI-SQUARE": "float64",
+}
+
+# Name of each goodness-of-fit block in the workbook, the frame it is exposed as and its data column
+TESTS = {
+    "Inter-Arrival": ("inter_arrival_chi_square", "INTER-ARRIVAL TIME(MIN)"),
+    "Service": ("service_chi_square", "SERVICE TIME (MIN)"),
+}
+
+FRAMES = ["customers", "inter_arrival_chi_square", "service_chi_square", "tests"]
+
+
+# Function to fingerprint the workbook by modification time and content hash
+def _file_signature(path):
+    with open(path, "rb") as file:
+        digest = hashlib.sha256(file.read()).hexdigest()
+    return {"mtime_ns": os.stat(path).st_mtime_ns, "sha256": digest}
+
+
+# Function to find the first row at or after `start` whose value in `column` equals `value`
+def _find_row(raw, column, value, start=0):
+    matches = raw.index[(raw[column] == value) & (raw.index >= start)]
+    return matches[0]
+
+
+# Function to parse the workbook into named, typed frames
+def parse_workbook(path=DATA_PATH):
+    raw = pd.read_excel(path, sheet_name="Sheet1")
+    raw.columns = [str(column).strip() for column in raw.columns]
+    label_column, name_column = "SERVICE TIME(END)", "INTER-ARRIVAL TIME(MIN)"  # Where the workbook puts its labels
+
+    # Customer rows run until the first empty CUSTOMER cell
+    first_blank = raw["CUSTOMER"].isna().idxmax()
+    customers = raw.loc[:first_blank - 1, list(CUSTOMER_COLUMNS)].astype(CUSTOMER_COLUMNS).reset_index(drop=True)
+    means = raw.loc[_find_row(raw, label_column, "MEAN=")]
+
+    frames = {"customers": customers}
+    tests = []
+    for test, (frame_name, data_column) in TESTS.items():
+        title_row = raw.index[(raw[label_column] == "GOODNESS OF FIT TEST") & (raw[name_column] == test)][0]
+        header = raw.loc[title_row + 1].tolist()
+
+        # Bin rows follow the header until the BINS cell is empty
+        block = raw.loc[title_row + 2:].copy()
+        block.columns = header
+        block = block.loc[:block["BINS"].isna().idxmax() - 1, list(CHI_SQUARE_COLUMNS)]
+        frames[frame_name] = block.astype(CHI_SQUARE_COLUMNS).reset_index(drop=True)
+
+        df_row = _find_row(raw, "CUSTOMER", "df=", title_row)
+        tests.append({
+            "TEST": test,
+            "MEAN": float(means[data_column]),
+            "DF": int(raw.loc[df_row, "ARRIVAL TIME"]),
+            "X^2TAB": float(raw.loc[_find_row(raw, "CUSTOMER", "X^2tab=", title_row), "ARRIVAL TIME"]),
+            "X^2CAL": float(raw.loc[_find_row(raw, "CUSTOMER", "X^2cal=", title_row), "ARRIVAL TIME"]),
+            "CONCLUSION": str(raw.loc[df_row, label_column]),
+        })
+    frames["tests"] = pd.DataFrame(tests).set_index("TEST")
+    return frames
+
+
+# Function to read the cache's workbook signature, or None when it is missing or unreadable
+def _read_meta(meta_path):
+    try:
+        with open(meta_path) as file:
+            meta = json.load(file)
+    except (OSError, ValueError):
+        return None
+    return meta if isinstance(meta, dict) else None
+
+
+# Function to read the cached frames, or None when any of them is missing or unreadable (e.g. a partial file)
+def _read_frames(frame_paths):
+    try:
+        return {name: pd.read_parquet(p) for name, p in frame_paths.items()}
+    except (OSError, ValueError, ImportError):
+        return None
+
+
+# Function to load the bank dataset, reusing the Parquet cache while the workbook is unchanged.
+# Cache files are written atomically, and an unreadable cache is parsed again and rewritten.
+def load_bank_data(path=DATA_PATH, cache_dir=CACHE_DIR):
+    meta_path = os.path.join(cache_dir, "meta.json")
+    frame_paths = {name: os.path.join(cache_dir, f"{name}.parquet") for name in FRAMES}
+
+    # Only hash the workbook when its modification time has changed
+    meta = _read_meta(meta_path)
+    if meta is not None and meta.get("mtime_ns") == os.stat(path).st_mtime_ns:
+        frames = _read_frames(frame_paths)
+        if frames is not None:
+            return frames
+        meta = None
+    signature = _file_signature(path)
+    frames = _read_frames(frame_paths) if meta is not None and meta.get("sha256") == signature["sha256"] else None
+    if frames is None:
+        frames = parse_workbook(path)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            for name, frame in frames.items():
+                write_atomic(frame_paths[name], frame.to_parquet)
+        except (ImportError, OSError):
+            return frames  # No Parquet engine or a read-only disk: serve the freshly parsed frames uncached
+
+    try:
+        write_atomic(meta_path, lambda file: file.write(json.dumps(signature).encode()))
+    except OSError:
+        pass
+    return frames
+
+
+# Generator reading the given columns of a CSV or Parquet file a chunk of rows at a time
+def read_chunks(path, columns, chunk_size=1_000_000):
+    if path.lower().endswith((".parquet", ".pq")):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        for chunk in pd.read_csv(path, usecols=columns, chunksize=chunk_size):
+            yield chunk
@@ -0,0 +1,63 @@
+import heapq
+import numpy as np
+
+
+# Function to create the server heap with every server free at time 0
+def server_heap(num_servers):
+    return [(0, server) for server in range(num_servers)]
+
+
+# Function to evaluate the single-server Lindley recursion without a Python loop.
+# With S the cumulative service time, end[i] = S[i] + max(free_time, max over k <= i of (arrival[k] - S[k-1])).
+# Float cumulative sums can round that end to just before arrival + service, so each start is taken as
+# max(arrival, previous end) (and an end never precedes its start): nobody starts before they arrive and
+# one customer's service never overlaps the next one's.
+def lindley(arrival, service, free_time=0):
+    arrival = np.asarray(arrival)
+    service = np.asarray(service)
+    total_service = np.cumsum(service)
+    slack = arrival - (total_service - service)
+    end = total_service + np.maximum(np.maximum.accumulate(slack), free_time)
+    start = np.maximum(arrival, np.r_[free_time, end[:-1]]).astype(end.dtype, copy=False)
+    return start, np.maximum(end, start)
+
+
+# Function to assign customers (in arrival order) to the server that becomes free the earliest.
+# Servers are kept in a min-heap of (free time, server), so ties go to the lowest server number.
+# Pass a heap from server_heap() to carry the server state over from one chunk of customers to the next.
+def dispatch(arrival, service, num_servers, heap=None):
+    arrival = np.asarray(arrival)
+    service = np.asarray(service)
+    dtype = np.result_type(arrival, service)
+
+    if heap is None:
+        heap = server_heap(num_servers)
+
+    # A single server needs no heap: use the vectorized Lindley recursion
+    if num_servers == 1:
+        start, end = lindley(arrival, service, free_time=heap[0][0])
+        if len(end):
+            heap[0] = (end[-1].item(), 0)
+        return np.zeros(len(arrival), dtype=np.int64), start.astype(dtype, copy=False), end.astype(dtype, copy=False)
+
+    servers = []
+    start_times = []
+    for arrival_time, service_time in zip(arrival.tolist(), service.tolist()):
+        free_time, server = heap[0]
+        start_time = arrival_time if arrival_time > free_time else free_time
+        heapq.heapreplace(heap, (start_time + service_time, server))
+        servers.append(server)
+        start_times.append(start_time)
+
+    start = np.array(start_times, dtype=dtype)
+    end = start + service
+    return np.array(servers, dtype=np.int64), start, end
+
+
+# Function to calculate turnaround, wait and response time for every customer
+# (wait is start - arrival, and dispatch never starts a customer before their arrival, so it is never negative)
+def queue_metrics(arrival, service, start, end):
+    turn_around = end - arrival
+    wait = start - arrival
+    response = start - arrival
+    return turn_around, wait, response
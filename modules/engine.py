@@ -0,0 +1,55 @@
+import numpy as np
+from modules.streaming import customer_chunks
+from modules.dispatch import dispatch, queue_metrics
+
+# Version of the sampling and dispatch logic; bump it whenever a change alters simulated results
+ENGINE_VERSION = 2
+
+# Columns of a simulation result, in display order
+RESULT_COLUMNS = [
+    "Customer", "Inter Arrival Time", "Arrival Time", "Service Time", "Server",
+    "Start Time", "End Time", "Turn Around Time", "Wait Time", "Response Time",
+]
+
+INT32 = np.iinfo(np.int32)
+
+
+# Function to store a column compactly: integers as int32 when they fit (int64 otherwise), anything else as float64
+def compact_column(values):
+    values = np.asarray(values)
+    if values.dtype.kind in "iub":
+        if values.size == 0 or (values.min() >= INT32.min and values.max() <= INT32.max):
+            return np.ascontiguousarray(values, dtype=np.int32)
+        return np.ascontiguousarray(values, dtype=np.int64)
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+# Function to build the typed result columns of dispatched customers, adding the queue metrics
+def result_columns(inter_arrival, arrival, service, server, start, end):
+    turn_around, wait, response = queue_metrics(arrival, service, start, end)
+    values = [np.arange(len(arrival)), inter_arrival, arrival, service, server, start, end, turn_around, wait, response]
+    return {name: compact_column(column) for name, column in zip(RESULT_COLUMNS, values)}
+
+
+# Function to view result columns as a DataFrame (pandas is only loaded when a table is needed)
+def as_frame(columns):
+    import pandas as pd
+
+    return pd.DataFrame(columns, copy=False)
+
+
+# Function to draw the arrival and service streams of a fixed number of customers in one batch.
+# The streams do not depend on the server count, so one draw can be dispatched to any number of servers.
+def sample_customers(model, params, num_customers, rng=None):
+    return next(customer_chunks(model, params, num_customers, chunk_size=num_customers, rng=rng))
+
+
+# Function to dispatch sampled customers to num_servers servers and return the per-customer columns
+def dispatch_customers(inter_arrival, arrival, service, num_servers):
+    server, start, end = dispatch(arrival, service, num_servers)
+    return result_columns(inter_arrival, arrival, service, server, start, end)
+
+
+# Function to simulate a fixed number of customers of a model in one batch and return the per-customer columns
+def simulate(model, params, num_servers, num_customers, rng=None):
+    return dispatch_customers(*sample_customers(model, params, num_customers, rng), num_servers)
@@ -1,7 +1,12 @@
+import hashlib
+import io
 import numpy as np
-import matplotlib.pyplot as plt
 import streamlit as st
-import matplotlib.colors as mcolors
+from modules.quantiles import PERCENTILES, PERCENTILE_METRICS, exact_percentiles
+from modules.timeline import occupancy_timeline, step_aggregates, time_weighted_metrics
+
+# Rendered charts kept as PNG bytes (least recently used are dropped first)
+CHART_CACHE_SIZE = 64
 
 
 def calculate_bin_gap(s_no):
@@ -18,134 +23,369 @@ def calculate_bin_gap(s_no):
         return 10 
 
 
-# Function to plot Turn Around Time vs Customers
-def entVsTA(s_no, TA):
-    bin_gap = calculate_bin_gap(s_no)
-    fig, ax = plt.subplots()
-    ax.bar(s_no, TA, align='center', alpha=0.7)
-    ax.set_xlabel('Customers')
-    ax.set_ylabel('Turn Around Time')
-    # ax.set_title('Turn Around Time in Queue for Each Customer')
+# Function to hash the inputs of a chart, so an unchanged chart is not drawn again on a rerun
+def chart_key(name, *inputs):
+    digest = hashlib.sha1(name.encode())
+    for value in inputs:
+        values = np.asarray(value)
+        if values.dtype == object:
+            values = values.astype(str)
+        digest.update(f"{values.dtype}{values.shape}".encode())
+        digest.update(np.ascontiguousarray(values).tobytes())
+    return digest.hexdigest()
+
+
+# Function to draw a chart on a fresh Figure and rasterize it, cached by key across sessions and reruns.
+# The Figure is never registered with pyplot, so it is freed as soon as it has been rasterized.
+@st.cache_data(max_entries=CHART_CACHE_SIZE, show_spinner=False)
+def _chart_png(key, _draw, figsize=None):
+    from matplotlib.figure import Figure  # matplotlib is only loaded once a chart is actually drawn
+
+    fig = Figure(figsize=figsize)
+    _draw(fig)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=200, bbox_inches="tight")
+    fig.clear()
+    return buffer.getvalue()
+
+
+# Function to show a chart from its cached PNG, drawing it only on a cache miss
+def show_chart(key, draw, figsize=None):
+    st.image(_chart_png(key, draw, figsize))
+
+
+# Above this many customers the per-customer charts switch to binned aggregates with at most LOD_BINS bins
+LOD_THRESHOLD = 500
+LOD_BINS = 400
+
+
+# Function to calculate mean, min, max and 95th percentile of each row of a 2-D array
+def _row_aggregates(rows):
+    return rows.mean(axis=1), rows.min(axis=1), rows.max(axis=1), np.percentile(rows, 95, axis=1)
+
+
+# Function to reduce per-customer values to aggregates over buckets of consecutive customers
+def bucket_aggregates(values, num_bins=LOD_BINS):
+    values = np.asarray(values, dtype=float)
+    bucket = -(-len(values) // num_bins)  # Ceiling division
+    full = len(values) // bucket
+    aggregates = [_row_aggregates(values[:full * bucket].reshape(full, bucket))]
+    if full * bucket < len(values):
+        aggregates.append(_row_aggregates(values[full * bucket:].reshape(1, -1)))
+    mean, low, high, p95 = (np.concatenate(parts) for parts in zip(*aggregates))
+    first_customer = np.arange(len(mean)) * bucket
+    return first_customer, bucket, mean, low, high, p95
+
+
+# Function to plot one value per customer, as bars for small runs and as binned aggregates
+# (or a histogram with mode="histogram") for large ones, so drawing cost does not grow with the run
+def customer_bar_chart(s_no, values, ylabel, mode="auto"):
+    if mode == "auto":
+        mode = "bars" if len(values) <= LOD_THRESHOLD else "binned"
+
+    def draw(fig):
+        ax = fig.subplots()
+        if mode == "bars":
+            ax.bar(s_no, values, align='center', alpha=0.7)
+            ax.set_xlabel('Customers')
+            ax.set_ylabel(ylabel)
+
+            # Create custom x-tick positions with dynamic bin gap (longer runs keep matplotlib's own ticks)
+            if len(s_no) <= 50:
+                bin_gap = calculate_bin_gap(s_no)
+                ax.set_xticks(range(0, len(s_no) + 1, bin_gap))
+        elif mode == "binned":
+            first, bucket, mean, low, high, p95 = bucket_aggregates(values)
+            edges = np.append(first, len(values))
+            ax.stairs(high, edges, baseline=low, fill=True, alpha=0.25, label="Min - Max")
+            ax.stairs(mean, edges, baseline=None, label="Mean")
+            ax.stairs(p95, edges, baseline=None, linestyle="--", label="95th Percentile")
+            ax.set_xlabel(f'Customers ({bucket:,} per bin)')
+            ax.set_ylabel(ylabel)
+            ax.legend()
+        else:
+            counts, edges = np.histogram(np.asarray(values, dtype=float), bins="auto")
+            ax.stairs(counts, edges, fill=True, alpha=0.7)
+            ax.set_xlabel(ylabel)
+            ax.set_ylabel('Customers')
+
+    show_chart(chart_key(f"{ylabel}-{mode}", s_no, values), draw)
 
-    # Create custom x-tick positions with dynamic bin gap
-    x_ticks = range(0, len(s_no) + 1, bin_gap)
-    ax.set_xticks(x_ticks)
 
-    st.pyplot(fig)
+# Function to plot Turn Around Time vs Customers
+def entVsTA(s_no, TA):
+    customer_bar_chart(s_no, TA, 'Turn Around Time')
 
 
 # Function to plot Arrival Time vs Customers
 def entVsArrival(s_no, arrival):
-    bin_gap = calculate_bin_gap(s_no)
-    fig, ax = plt.subplots()
-    ax.bar(s_no, arrival, align='center', alpha=0.7)
-    ax.set_xlabel('Customers')
-    ax.set_ylabel('Arrival Time')
-    # ax.set_title('Arrival Time in Queue for Each Customer')
-
-    # Create custom x-tick positions with dynamic bin gap
-    x_ticks = range(0, len(s_no) + 1, bin_gap)
-    ax.set_xticks(x_ticks)
-
-    st.pyplot(fig)
+    customer_bar_chart(s_no, arrival, 'Arrival Time')
 
 
 # Function to plot Service Time vs Customers
 def entVsService(s_no, service):
-    bin_gap = calculate_bin_gap(s_no)
-    fig, ax = plt.subplots()
-    ax.bar(s_no, service, align='center', alpha=0.7)
-    ax.set_xlabel('Customers')
-    ax.set_ylabel('Service Time')
-    # ax.set_title('Service Time in Queue for Each Customer')
-
-    # Create custom x-tick positions with dynamic bin gap
-    x_ticks = range(0, len(s_no) + 1, bin_gap)
-    ax.set_xticks(x_ticks)
-
-    st.pyplot(fig)
+    customer_bar_chart(s_no, service, 'Service Time')
 
 
 # Function to plot Wait Time vs Customers
 def entVsWT(s_no, WT):
-    bin_gap = calculate_bin_gap(s_no)
-    fig, ax = plt.subplots()
-    ax.bar(s_no, WT, align='center', alpha=0.7)
-    ax.set_xlabel('Customers')
-    ax.set_ylabel('Wait Time')
-    # ax.set_title('Wait Time in Queue for Each Customer')
+    customer_bar_chart(s_no, WT, 'Wait Time')
 
-    # Create custom x-tick positions with dynamic bin gap
-    x_ticks = range(0, len(s_no) + 1, bin_gap)
-    ax.set_xticks(x_ticks)
 
-    st.pyplot(fig)
+# Function to show exact percentiles of the per-customer times and a histogram of wait times marked with them
+def show_percentiles(df):
+    percentiles = {metric: exact_percentiles(df[metric]) for metric in PERCENTILE_METRICS}
+    st.dataframe({
+        "Metric": PERCENTILE_METRICS,
+        **{f"P{p}": [percentiles[metric][p] for metric in PERCENTILE_METRICS] for p in PERCENTILES},
+    }, hide_index=True)
 
+    wait = df["Wait Time"].to_numpy(dtype=float)
+    wait_percentiles = percentiles["Wait Time"]
 
-# Function to visualize Server Utilization
-def ServerUtilization(Server_util,server_no):
-    idleTime = 1 - Server_util
-    y = np.array([Server_util, idleTime])
-    mylabels = ["Utilized Server", "Idle Time"]
+    def draw(fig):
+        ax = fig.subplots()
+        counts, edges = np.histogram(wait, bins="auto")
+        ax.stairs(counts, edges, fill=True, alpha=0.7)
+        for p, linestyle in zip(PERCENTILES, ["-", "--", ":"]):
+            ax.axvline(wait_percentiles[p], color="black", linestyle=linestyle, label=f"P{p} = {wait_percentiles[p]:g}")
+        ax.set_xlabel("Wait Time")
+        ax.set_ylabel("Customers")
+        ax.legend()
 
-    fig, ax = plt.subplots()
-    ax.pie(y, labels=mylabels, autopct='%1.1f%%')
-    ax.set_title(f"Server {server_no}")
-    st.pyplot(fig)
+    show_chart(chart_key("wait-percentiles", wait), draw)
 
 
-# Function to visualize Server Utilization
-def OverallUtilization(overall_util):
-    idleTime = 1 - overall_util
-    y = np.array([overall_util, idleTime])
-    mylabels = ["Utilized Server", "Idle Time"]
+# Function to draw a utilized/idle pie chart
+def utilization_pie(utilization, title):
+    def draw(fig):
+        ax = fig.subplots()
+        y = np.array([utilization, 1 - utilization])
+        mylabels = ["Utilized Server", "Idle Time"]
+        ax.pie(y, labels=mylabels, autopct='%1.1f%%')
+        ax.set_title(title)
 
-    fig, ax = plt.subplots()
-    ax.pie(y, labels=mylabels, autopct='%1.1f%%')
-    ax.set_title("Overall Model Utilization")
-    st.pyplot(fig)
+    show_chart(chart_key(title, utilization), draw)
 
 
+# Function to visualize Server Utilization
+def ServerUtilization(Server_util,server_no):
+    utilization_pie(Server_util, f"Server {server_no}")
 
-# Function to calculate server utilization
-def calculate_server_utilization(df):
 
-    server_service_times = df.groupby('Server')['Service Time'].sum()
+# Function to visualize Server Utilization
+def OverallUtilization(overall_util):
+    utilization_pie(overall_util, "Overall Model Utilization")
 
-    # total_time = df['End Time'].max() - 0
-    total_service_time = np.sum(df["Service Time"])
 
-    # Calculate server utilization
-    server_utilization = {server: service_time / total_service_time for server, service_time in server_service_times.items()}
 
-    return server_utilization
+# Function to calculate server utilization: each server's busy time over the elapsed time until the last departure
+def calculate_server_utilization(df, num_servers=None):
+    server = df["Server"].to_numpy(dtype=np.int64)
+    num_servers = num_servers if num_servers is not None else int(server.max()) + 1 if len(server) else 0
+    busy_time = np.bincount(server, weights=df["Service Time"].to_numpy(dtype=float), minlength=num_servers)
+    total_time = df["End Time"].max() if len(server) else 0
 
+    # Calculate server utilization
+    server_utilization = {s: busy / total_time if total_time else 0.0 for s, busy in enumerate(busy_time)}
 
-def plot_gantt_chart(df, num_servers):
-    # Map servers to specific colors
-    server_color_map = {server: color for server, color in zip(df['Server'].unique(), mcolors.TABLEAU_COLORS.values())}
+    return server_utilization
 
-    fig, ax = plt.subplots(figsize=(13, 10))
 
-    for i, row in df.iterrows():
-        server = row["Server"]
-        server_color = server_color_map[server]  # Use the predefined color mapping
-        ax.barh(f"Server {server+1}", width=row["Service Time"], left=row["Start Time"],
-                color=server_color, edgecolor="black")
-        text = f'C:{row["Customer"]}\nST: {row["Service Time"]}'
-        ax.text(row["Start Time"] + row["Service Time"] / 2, server, text, ha="center", va="center",
-                color="black", fontsize=9)
+# Function to plot a step function of time: exact steps for short runs, min-max bands with the
+# time-weighted mean per time bucket for long ones
+def timeline_chart(times, values, ylabel):
+    def draw(fig):
+        ax = fig.subplots()
+        if len(times) <= LOD_THRESHOLD or times[-1] <= times[0]:
+            ax.step(times, values, where="post")
+        else:
+            edges, low, high, mean = step_aggregates(times, values, LOD_BINS)
+            ax.stairs(high, edges, baseline=low, fill=True, alpha=0.25, label="Min - Max")
+            ax.stairs(mean, edges, baseline=None, label="Time-Weighted Mean")
+            ax.legend()
+        ax.set_xlabel("Time")
+        ax.set_ylabel(ylabel)
+        ax.grid(axis="y", linestyle="--", alpha=0.7)
+
+    show_chart(chart_key(f"timeline-{ylabel}", times, values), draw)
+
+
+# Function to show the queue length, number in system and busy servers over time with their time averages
+def show_timeline(df, num_servers):
+    metrics = time_weighted_metrics(df, num_servers)
+    st.write(f"**Time-Average Number in System (L)**: {metrics['L']:.2f}")
+    st.write(f"**Time-Average Queue Length (Lq)**: {metrics['Lq']:.2f}")
+    st.write(f"**Time-Average Busy Servers**: {metrics['Busy Servers']:.2f} of {num_servers}")
+
+    times, in_system, queue, busy = occupancy_timeline(df["Arrival Time"], df["Start Time"], df["End Time"])
+    timeline_chart(times, queue, "Queue Length")
+    timeline_chart(times, in_system, "Number in System")
+    timeline_chart(times, busy, "Busy Servers")
+
+
+# Labels are only drawn when a bar is at least this many pixels wide (and its row this many pixels tall)
+# and few enough customers are in view
+GANTT_LABEL_MIN_PIXELS = 45
+GANTT_LABEL_MIN_ROW_PIXELS = 28
+GANTT_LABEL_MAX_CUSTOMERS = 300
+
+
+# Function to ask for the time window shown by the Gantt chart; None keeps the whole run in view
+def gantt_window(df, key):
+    x_max = int(df["End Time"].max()) + 2
+    window = st.slider("Time window", min_value=0, max_value=x_max, value=(0, x_max), key=key)
+    return None if window == (0, x_max) else window
+
+
+def plot_gantt_chart(df, num_servers, window=None):
+    server = df["Server"].to_numpy(dtype=np.int64)
+    start = df["Start Time"].to_numpy(dtype=float)
+    service = df["Service Time"].to_numpy(dtype=float)
+    customer = df["Customer"].to_numpy()
+
+    # Restrict to the customers in service inside the time window (the viewport for long runs)
+    if window is not None:
+        in_view = (start < window[1]) & (start + service > window[0])
+        server, start, service, customer = server[in_view], start[in_view], service[in_view], customer[in_view]
+        x_min, x_max = window
+    else:
+        x_min, x_max = 0, int(df["End Time"].max()) + 2
+
+    height = min(max(4, 0.6 * num_servers + 2), 20)
+    window_key = (x_min, x_max, num_servers)
+    show_chart(chart_key("Gantt", server, start, service, customer, window_key),
+               lambda fig: _draw_gantt(fig, server, start, service, customer, num_servers, x_min, x_max),
+               figsize=(13, height))
+
+
+# Function to draw the Gantt chart on a Figure
+def _draw_gantt(fig, server, start, service, customer, num_servers, x_min, x_max):
+    import matplotlib.colors as mcolors
+
+    ax = fig.subplots()
+
+    # One collection of bars per server instead of one bar per customer
+    colors = list(mcolors.TABLEAU_COLORS.values())
+    order = np.argsort(server, kind="stable")
+    bounds = np.searchsorted(server[order], np.arange(num_servers + 1))
+    edge_width = 0.8 if len(order) <= GANTT_LABEL_MAX_CUSTOMERS else 0.2
+    for s in range(num_servers):
+        rows = order[bounds[s]:bounds[s + 1]]
+        if len(rows):
+            ax.broken_barh(np.column_stack([start[rows], service[rows]]), (s - 0.4, 0.8),
+                           facecolors=colors[s % len(colors)], edgecolor="black", linewidth=edge_width)
+
+    ax.set_xlim(x_min, x_max)
+    ax.set_ylim(-0.5, num_servers - 0.5)
+    if num_servers <= 50:
+        ax.set_yticks(range(num_servers))
+        ax.set_yticklabels([f"Server {s + 1}" for s in range(num_servers)])
+
+    # Per-customer labels only where they would be legible, centred on the visible part of each bar
+    position = ax.get_position()
+    row_pixels = fig.get_figheight() * fig.dpi * position.height / num_servers
+    if len(start) <= GANTT_LABEL_MAX_CUSTOMERS and row_pixels >= GANTT_LABEL_MIN_ROW_PIXELS:
+        pixels_per_unit = fig.get_figwidth() * fig.dpi * position.width / max(x_max - x_min, 1e-9)
+        visible_start = np.maximum(start, x_min)
+        visible_end = np.minimum(start + service, x_max)
+        for i in np.flatnonzero((visible_end - visible_start) * pixels_per_unit >= GANTT_LABEL_MIN_PIXELS):
+            ax.text((visible_start[i] + visible_end[i]) / 2, server[i], f'C:{customer[i]}\nST: {service[i]:g}',
+                    ha="center", va="center", color="black", fontsize=9, clip_on=True)
 
     ax.set_xlabel("Time")
     ax.set_ylabel("Servers")
     # ax.set_title("Gantt Chart for Customers with Multiple Servers")
     ax.grid(axis="x", linestyle="--", alpha=0.7)
 
-    # Dynamically calculate bin_gap for x-axis
-    max_time = int(df["End Time"].max()) + 2
-    bin_gap = calculate_bin_gap(max_time)
-    x_ticks = list(range(0, max_time + 1, bin_gap))
-    ax.set_xticks(x_ticks)
-
-    plt.tight_layout()
-    st.pyplot(fig)
+    # Dynamically calculate bin_gap for x-axis (long time spans keep matplotlib's own ticks)
+    if x_max - x_min <= 100:
+        bin_gap = calculate_bin_gap(int(x_max - x_min))
+        ax.set_xticks(list(range(int(x_min), int(x_max) + 1, bin_gap)))
+
+    fig.tight_layout()
+
+
+# Seconds between progress updates of a running background job
+JOB_POLL_SECONDS = 0.5
+
+
+# Function to keep a newly submitted background job in session state, cancelling the one it replaces
+def start_job(key, job):
+    previous = st.session_state.get(key)
+    if previous is not None and previous.running:
+        previous.cancel()
+    st.session_state[key] = job
+
+
+# Function to show the background job kept under key: a progress bar and a cancel button while it runs, then
+# its results drawn by render. Only this fragment reruns while the job is polled, so the page stays usable.
+def show_job(key, render):
+    job = st.session_state.get(key)
+    if job is None:
+        return
+    polling = job.running
+
+    @st.fragment(run_every=JOB_POLL_SECONDS if polling else None)
+    def job_status():
+        if job.running:
+            st.progress(job.progress, text=f"Running... {job.progress:.0%}")
+            if st.button("Cancel", key=f"{key}_cancel"):
+                job.cancel()
+        elif polling:
+            st.rerun()  # Redraw the page once so the finished job is no longer polled
+        elif job.cancelled:
+            st.info("The run was cancelled.")
+        elif job.error is not None:
+            st.error(f"The run failed: {job.error}")
+        else:
+            render(job.result(), **job.info)
+
+    job_status()
+
+
+# Function to ask for the length of a long-run (streaming) simulation
+def long_run_controls():
+    run_length = st.radio("Run length", ("Customers", "Time horizon"), horizontal=True)
+    if run_length == "Customers":
+        num_customers = st.number_input("Number of customers", min_value=1000, value=1000000, step=1000)
+        return num_customers, None
+    horizon = st.number_input("Time horizon (minutes)", min_value=100.0, value=1000000.0, step=100.0)
+    return None, horizon
+
+
+# Function to show the running statistics of a long-run simulation
+def show_long_run_summary(summary):
+    stats = summary["Stats"]
+    st.write(f"**Customers Simulated**: {summary['Customers']:,}")
+    st.write(f"**Elapsed Time**: {summary['Elapsed Time']:,.2f}")
+    percentiles = {metric: sketch.percentiles() for metric, sketch in summary["Sketches"].items()}
+    table = {
+        "Metric": list(stats.keys()),
+        "Mean": [s.mean for s in stats.values()],
+        "Std. Dev.": [s.std for s in stats.values()],
+    }
+    for p in PERCENTILES:
+        table[f"P{p}"] = [percentiles[metric][p] if metric in percentiles else None for metric in stats]
+    st.dataframe(table, hide_index=True)
+    OverallUtilization(summary["Overall Utilization"])
+
+
+# Function to ask for the settings of an independent-replications run
+def replication_controls():
+    replications = st.number_input("Number of replications", min_value=2, max_value=1000, value=10, step=1)
+    num_customers = st.number_input("Customers per replication", min_value=100, value=100000, step=1000)
+    seed = st.number_input("Seed", min_value=0, value=12345, step=1)
+    confidence = st.selectbox("Confidence level", [0.90, 0.95, 0.99], index=1)
+    return replications, num_customers, seed, confidence
+
+
+# Function to show the replication means with their confidence intervals
+def show_replication_summary(summary, confidence):
+    st.dataframe({
+        "Metric": list(summary.keys()),
+        "Mean": [row["Mean"] for row in summary.values()],
+        f"{confidence:.0%} CI Lower": [row["Lower"] for row in summary.values()],
+        f"{confidence:.0%} CI Upper": [row["Upper"] for row in summary.values()],
+        **{f"P{p}": [row.get(f"P{p}") for row in summary.values()] for p in PERCENTILES},
+    }, hide_index=True)
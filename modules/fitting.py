@@ -0,0 +1,199 @@
+import math
+import numpy as np
+from modules.streaming import RunningStats
+
+# Candidate distributions and the number of parameters each one estimates from the data
+DISTRIBUTIONS = {
+    "Poisson": 1,
+    "Exponential": 1,
+    "Normal": 2,
+    "Uniform": 2,
+}
+
+# Adjacent bins are merged until each one expects at least this many observations
+MIN_EXPECTED = 5
+
+
+# Histogram with fixed-width bins starting at 0, filled one chunk of values at a time.
+# Only the non-empty bins are stored, so one outlier far out in a long log costs two edges instead of
+# an array of counts reaching up to it; each run of empty bins between them shows as one empty bin.
+class Histogram:
+    def __init__(self, bin_width=1.0):
+        self.bin_width = bin_width
+        self.bins = np.zeros(0, dtype=np.int64)  # Indices of the non-empty bins, ascending
+        self.bin_counts = np.zeros(0, dtype=np.int64)
+        self.stats = RunningStats()
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return
+        if values.min() < 0:
+            raise ValueError("Only non-negative values (times) can be fitted.")
+        self._add(*np.unique((values // self.bin_width).astype(np.int64), return_counts=True))
+        self.stats.update(values)
+        self.minimum = min(self.minimum, values.min())
+        self.maximum = max(self.maximum, values.max())
+
+    def merge(self, other):
+        if other.bin_width != self.bin_width:
+            raise ValueError("Only histograms with the same bin width can be merged.")
+        self._add(other.bins, other.bin_counts)
+        self.stats.merge(other.stats)
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    def _add(self, bins, counts):
+        self.bins, index = np.unique(np.concatenate([self.bins, bins]), return_inverse=True)
+        totals = np.zeros(len(self.bins), dtype=np.int64)
+        np.add.at(totals, index, np.concatenate([self.bin_counts, counts]))
+        self.bin_counts = totals
+
+    # Bin indices of the edges: 0 and both ends of every non-empty bin
+    def _edge_bins(self):
+        return np.unique(np.concatenate([[0], self.bins, self.bins + 1]))
+
+    @property
+    def edges(self):
+        return self._edge_bins() * self.bin_width
+
+    @property
+    def counts(self):
+        edge_bins = self._edge_bins()
+        counts = np.zeros(len(edge_bins) - 1, dtype=np.int64)
+        counts[np.searchsorted(edge_bins, self.bins)] = self.bin_counts
+        return counts
+
+
+# Function to build a histogram of an array of samples
+def histogram(values, bin_width=1.0):
+    hist = Histogram(bin_width)
+    hist.update(values)
+    return hist
+
+
+# Function to build a histogram of one column of a CSV or Parquet file without loading the whole file
+def histogram_from_file(path, column, bin_width=1.0, chunk_size=1_000_000):
+    from modules.dataset import read_chunks
+
+    hist = Histogram(bin_width)
+    for chunk in read_chunks(path, [column], chunk_size):
+        hist.update(chunk[column].to_numpy(dtype=float))
+    return hist
+
+
+# Function to estimate a distribution's parameters from the histogram's moments and range
+# (a uniform spans the first to the last non-empty bin)
+def estimate_parameters(hist, distribution):
+    mean, std = float(hist.stats.mean), float(hist.stats.std)
+    if distribution == "Poisson":
+        return {"lambda": mean}
+    if distribution == "Exponential":
+        return {"mean": mean}
+    if distribution == "Normal":
+        return {"mean": mean, "std": std}
+    width = hist.bin_width
+    return {"min": math.floor(hist.minimum / width) * width, "max": (math.floor(hist.maximum / width) + 1) * width}
+
+
+# Function to evaluate a fitted distribution's CDF at an array of bin edges.
+# Poisson counts the integers below each edge, so bin [lower, upper) holds the integers ceil(lower) .. ceil(upper) - 1.
+def cdf_at_edges(distribution, params, edges):
+    from scipy.stats import expon, norm, poisson, uniform  # scipy is loaded on first use
+
+    edges = np.asarray(edges, dtype=float)
+    if distribution == "Poisson":
+        return poisson.cdf(np.ceil(edges) - 1, params["lambda"])
+    if distribution == "Exponential":
+        return expon.cdf(edges, scale=params["mean"])
+    if distribution == "Normal":
+        return norm.cdf(edges, params["mean"], params["std"]) if params["std"] > 0 else (edges > params["mean"]) * 1.0
+    return uniform.cdf(edges, params["min"], params["max"] - params["min"])
+
+
+# Function to merge adjacent bins until every bin expects at least min_expected observations.
+# Returns the indices of the edges that are kept.
+def _merge_bins(expected, min_expected):
+    keep = [0]
+    running = 0.0
+    for index, value in enumerate(expected, start=1):
+        running += value
+        if running >= min_expected:
+            keep.append(index)
+            running = 0.0
+    if keep[-1] != len(expected):
+        if len(keep) > 1:
+            keep[-1] = len(expected)  # Fold the short tail into the last full bin
+        else:
+            keep.append(len(expected))
+    return np.array(keep)
+
+
+# Function to build the chi-square table of a fitted distribution (same columns as the workbook's blocks).
+# The first bin reaches down to the distribution's lower end and the last one up to its upper end.
+def frequency_table(hist, distribution, params, min_expected=MIN_EXPECTED):
+    edges = hist.edges
+    cdf = cdf_at_edges(distribution, params, edges)
+    cdf[0], cdf[-1] = 0.0, 1.0
+    expected = np.diff(cdf) * hist.stats.count
+
+    keep = _merge_bins(expected, min_expected)
+    observed = np.add.reduceat(hist.counts, keep[:-1]) if len(hist.counts) else hist.counts
+    lower, upper = edges[keep[:-1]], edges[keep[1:]]
+    lbp, ubp = cdf[keep[:-1]], cdf[keep[1:]]
+    expected = (ubp - lbp) * hist.stats.count
+    with np.errstate(divide="ignore", invalid="ignore"):
+        chi_square = (observed - expected) ** 2 / expected
+    return {
+        "BINS": [f"{lo:g}-{hi:g}" for lo, hi in zip(lower, upper)],
+        "OBS. FREQ": observed,
+        "LOWER": lower,
+        "UPPER": upper,
+        "LBP": lbp,
+        "UBP": ubp,
+        "UBP-LBP": ubp - lbp,
+        "EXP. FREQ": expected,
+        "CHI-SQUARE": chi_square,
+    }
+
+
+# Function to test one distribution against the histogram with the chi-square and Kolmogorov-Smirnov tests.
+# KS compares the CDFs at the bin edges, which is exact for data recorded on the bins (whole minutes).
+def fit_distribution(hist, distribution, min_expected=MIN_EXPECTED):
+    from scipy.stats import chi2, kstwo
+
+    params = estimate_parameters(hist, distribution)
+    table = frequency_table(hist, distribution, params, min_expected)
+    chi_square = float(np.sum(table["CHI-SQUARE"]))
+    df = len(table["BINS"]) - 1 - DISTRIBUTIONS[distribution]
+
+    count = hist.stats.count
+    empirical = np.cumsum(hist.counts) / count
+    ks = float(np.max(np.abs(empirical - cdf_at_edges(distribution, params, hist.edges[1:]))))
+    return {
+        "Distribution": distribution,
+        "Parameters": params,
+        "Chi-Square": chi_square,
+        "DF": df,
+        "Chi-Square p-value": float(chi2.sf(chi_square, df)) if df > 0 else math.nan,
+        "KS": ks,
+        "KS p-value": float(kstwo.sf(ks, count)),
+        "Table": table,
+    }
+
+
+# Function to fit every candidate distribution and rank them, best first.
+# The chi-square p-value decides where it has degrees of freedom left; the KS p-value otherwise.
+def best_fit(hist, distributions=None, min_expected=MIN_EXPECTED):
+    if hist.stats.count == 0:
+        raise ValueError("No values to fit.")
+    fits = [fit_distribution(hist, name, min_expected) for name in (distributions or DISTRIBUTIONS)]
+
+    def score(fit):
+        p_value = fit["Chi-Square p-value"]
+        return (0 if math.isnan(p_value) else 1, 0 if math.isnan(p_value) else p_value, fit["KS p-value"])
+
+    return sorted(fits, key=score, reverse=True)
@@ -0,0 +1,120 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+import numpy as np
+from modules.replications import run_replication, summarize_replications
+from modules.streaming import customer_chunks, summarize_chunks
+
+# Worker processes shared by every session of the app; one core is left for the Streamlit server itself
+JOB_WORKERS = max(1, (os.cpu_count() or 1) - 1)
+
+_executor = None
+_manager = None
+_pool_lock = threading.Lock()
+
+
+class JobCancelled(Exception):
+    pass
+
+
+# Function to start the shared worker pool, and the manager holding the jobs' progress and cancel flags, on first use
+def _job_pool():
+    global _executor, _manager
+    with _pool_lock:
+        if _executor is None:
+            # The Streamlit server runs many threads, and forking a threaded process can deadlock the child
+            context = multiprocessing.get_context("forkserver")
+            _manager = context.Manager()
+            _executor = ProcessPoolExecutor(max_workers=JOB_WORKERS, mp_context=context)
+    return _executor, _manager
+
+
+# Handle of a simulation running in the worker pool, kept in session state so reruns of the page do not lose it.
+# Progress is the share of the run done (shared with the worker) or, without one, the share of futures finished.
+class Job:
+    def __init__(self, futures, finish, progress=None, cancel_flag=None, info=None):
+        self.futures = futures
+        self.finish = finish
+        self.progress_value = progress
+        self.cancel_flag = cancel_flag
+        self.info = info or {}
+        self.cancelled = False
+        self._result = None
+
+    @property
+    def running(self):
+        return not all(future.done() for future in self.futures)
+
+    @property
+    def progress(self):
+        if not self.running:
+            return 1.0
+        if self.progress_value is not None:
+            return min(1.0, max(0.0, self.progress_value.value))
+        return sum(future.done() for future in self.futures) / len(self.futures)
+
+    @property
+    def error(self):
+        if self.running or self.cancelled:
+            return None
+        for future in self.futures:
+            if future.exception() is not None:
+                return future.exception()
+        return None
+
+    # Queued work is dropped and a running long run stops at its next chunk
+    def cancel(self):
+        self.cancelled = True
+        if self.cancel_flag is not None:
+            self.cancel_flag.set()
+        for future in self.futures:
+            future.cancel()
+
+    # The results are combined once, as merging the sketches changes them
+    def result(self):
+        if self.cancelled:
+            raise JobCancelled()
+        if self._result is None:
+            try:
+                self._result = self.finish([future.result() for future in self.futures])
+            except CancelledError:
+                raise JobCancelled()
+        return self._result
+
+
+# Function to run a long-run simulation in a worker, recording the share of the run done after every chunk
+# and stopping between chunks once the job is cancelled
+def _long_run(model, params, num_servers, num_customers, horizon, seed, chunk_size, progress, cancel_flag):
+    def tracked(chunks):
+        produced = 0
+        for chunk in chunks:
+            if cancel_flag.is_set():
+                raise JobCancelled()
+            yield chunk
+            produced += len(chunk[0])
+            progress.value = produced / num_customers if num_customers else chunk[1][-1] / horizon
+
+    chunks = customer_chunks(model, params, num_customers, horizon, chunk_size, np.random.default_rng(seed))
+    return summarize_chunks(tracked(chunks), num_servers)
+
+
+# Function to submit a long-run (streaming) simulation to the worker pool
+def submit_long_run(model, params, num_servers, num_customers=None, horizon=None, seed=None, chunk_size=100_000):
+    executor, manager = _job_pool()
+    progress, cancel_flag = manager.Value("d", 0.0), manager.Event()
+    future = executor.submit(_long_run, model, params, num_servers, num_customers, horizon, seed, chunk_size,
+                             progress, cancel_flag)
+    return Job([future], lambda results: results[0], progress, cancel_flag)
+
+
+# Function to submit independent replications to the worker pool, one task per replication, each seeded
+# from its own child of one SeedSequence
+def submit_replications(model, params, num_servers, replications=10, num_customers=None, horizon=None,
+                        seed=None, confidence=0.95):
+    executor, _ = _job_pool()
+    futures = [
+        executor.submit(run_replication, model, params, num_servers, child, num_customers, horizon)
+        for child in np.random.SeedSequence(seed).spawn(replications)
+    ]
+    return Job(futures, lambda results: summarize_replications(results, confidence), info={"confidence": confidence})
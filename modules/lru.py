@@ -0,0 +1,29 @@
+import threading
+from collections import OrderedDict
+
+
+# Least recently used cache shared by every session thread of the app: each lookup or insert holds the lock,
+# so one session cannot evict a key while another is between finding it and marking it as used
+class LRUCache:
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    # Returns None when the key is not cached
+    def get(self, key):
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
@@ -0,0 +1,55 @@
+import numpy as np
+from modules.sampling import (
+    poisson_cp_table, rounded_poisson_cp_table, rounded_normal_cp_table, inverse_cdf, sample_service_times,
+    empirical_alias_table, sample_empirical,
+)
+
+
+# Function to make a sampler drawing from a cumulative probability table.
+# The lookup side follows the comparison each simulator page uses on its table.
+def table_sampler(cp_values, side):
+    return lambda size, rng: inverse_cdf(cp_values, rng.random(size), side=side)
+
+
+# Function to make a sampler drawing exponential times (rounded up to whole minutes)
+def exponential_sampler(mean):
+    return lambda size, rng: sample_service_times(mean, size, rng)
+
+
+# Function to make a sampler drawing from the empirical distribution of observed values (alias method)
+def empirical_sampler(observed):
+    table = empirical_alias_table(observed)
+    return lambda size, rng: sample_empirical(table, size, rng)
+
+
+# Each model returns (inter-arrival sampler, service sampler); a sampler draws `size` values with `rng`.
+def mms_model(lambda_rate, mu_rate):
+    return table_sampler(np.append(poisson_cp_table(lambda_rate), 1), "right"), exponential_sampler(mu_rate)
+
+
+def ggs_model(lembda, meu, sigma):
+    return table_sampler(rounded_normal_cp_table(meu, sigma), "left"), exponential_sampler(meu)
+
+
+def mgs_model(lembda, meu_min, meu_max):
+    return table_sampler(rounded_poisson_cp_table(lembda), "right"), exponential_sampler((meu_min + meu_max) / 2)
+
+
+# Inter-arrival and service times drawn from recorded data (e.g. the bank workbook's columns)
+def empirical_model(inter_arrival_values, service_values):
+    return empirical_sampler(inter_arrival_values), empirical_sampler(service_values)
+
+
+# Scalar parameters of the parametric models, in the order of their function's arguments
+MODEL_PARAMS = {
+    "mms": ["lambda_rate", "mu_rate"],
+    "ggs": ["lembda", "meu", "sigma"],
+    "mgs": ["lembda", "meu_min", "meu_max"],
+}
+
+MODELS = {
+    "mms": mms_model,
+    "ggs": ggs_model,
+    "mgs": mgs_model,
+    "empirical": empirical_model,
+}
@@ -0,0 +1,87 @@
+import math
+import numpy as np
+
+# Percentiles reported for wait, turnaround and response times
+PERCENTILES = [50, 95, 99]
+
+# Metrics whose percentiles are tracked
+PERCENTILE_METRICS = ["Turn Around Time", "Wait Time", "Response Time"]
+
+
+# Function to calculate exact percentiles of an array that fits in memory
+def exact_percentiles(values, percentiles=PERCENTILES):
+    values = np.asarray(values, dtype=float)
+    if values.size == 0:
+        return {p: math.nan for p in percentiles}
+    return dict(zip(percentiles, np.percentile(values, percentiles).tolist()))
+
+
+# Mergeable quantile sketch for non-negative values (log-spaced buckets, as in DDSketch).
+# Every quantile is within relative_accuracy of the true sample quantile, memory grows only with
+# log(max / min), and two sketches merge by adding their bucket counts, so per-chunk or per-worker
+# sketches combine into the sketch of all values without keeping any samples.
+# While every value seen is a whole number (e.g. minutes), quantiles are rounded to whole numbers,
+# which makes them exact below 1 / (2 * relative_accuracy).
+class QuantileSketch:
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.zero_count = 0
+        self.offset = 0
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.integer_valued = True
+
+    @property
+    def count(self):
+        return self.zero_count + int(self.counts.sum())
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return
+        if values.min() < 0:
+            raise ValueError("The quantile sketch only takes non-negative values.")
+        self.integer_valued = self.integer_valued and bool(np.all(values == np.floor(values)))
+        positive = values[values > 0]
+        self.zero_count += values.size - positive.size
+        if positive.size:
+            index = np.ceil(np.log(positive) / self.log_gamma).astype(np.int64)
+            low = int(index.min())
+            self._add(low, np.bincount(index - low))
+
+    def merge(self, other):
+        if other.gamma != self.gamma:
+            raise ValueError("Only sketches with the same relative accuracy can be merged.")
+        self.zero_count += other.zero_count
+        self.integer_valued = self.integer_valued and other.integer_valued
+        if len(other.counts):
+            self._add(other.offset, other.counts)
+
+    def _add(self, offset, counts):
+        if len(self.counts) == 0:
+            self.offset, self.counts = offset, counts.astype(np.int64)
+            return
+        low = min(self.offset, offset)
+        high = max(self.offset + len(self.counts), offset + len(counts))
+        merged = np.zeros(high - low, dtype=np.int64)
+        merged[self.offset - low:self.offset - low + len(self.counts)] += self.counts
+        merged[offset - low:offset - low + len(counts)] += counts
+        self.offset, self.counts = low, merged
+
+    def quantiles(self, fractions):
+        fractions = np.asarray(fractions, dtype=float)
+        count = self.count
+        if count == 0:
+            return np.full(fractions.shape, np.nan)
+        rank = np.floor(fractions * (count - 1))  # Rank of the lower sample, as in np.percentile(method="lower")
+        cumulative = self.zero_count + np.cumsum(self.counts)
+        bucket = np.searchsorted(cumulative, rank, side="right")
+        value = 2 * self.gamma ** (self.offset + bucket) / (self.gamma + 1)  # Midpoint of the bucket in relative terms
+        if self.integer_valued:
+            value = np.round(value)
+        return np.where(rank < self.zero_count, 0.0, value)
+
+    def percentiles(self, percentiles=PERCENTILES):
+        return dict(zip(percentiles, self.quantiles(np.asarray(percentiles) / 100).tolist()))
@@ -0,0 +1,144 @@
+import numpy as np
+
+# Result fields of each analytic model (same order as the calculator pages return them)
+MMS_FIELDS = ["rho", "P0", "Lq", "L", "W", "Wq"]
+MGS_FIELDS = ["P0", "rho", "Lq", "L", "Wq", "W"]
+GGS_FIELDS = ["Lq", "Wq", "Ws", "Ls", "P0"]
+
+# Up to this many scenarios Erlang B is evaluated one scenario at a time
+SCALAR_ERLANG_LIMIT = 32
+
+
+# Function to pack result arrays into a structured array with a `stable` flag (rho < 1) per scenario
+def _results(fields, values, stable):
+    stable = np.atleast_1d(stable)
+    columns = [np.where(stable, np.atleast_1d(value), np.nan) for value in values]
+    return np.rec.fromarrays(columns + [stable], names=fields + ["stable"])
+
+
+# Function to calculate Erlang B for arrays of offered load a and server count c with the recurrence
+# B(0) = 1, B(n) = a B(n-1) / (n + a B(n-1)), which is O(c), stays in [0, 1] and never overflows
+def erlang_b(a, c):
+    a, c = np.broadcast_arrays(np.asarray(a, dtype=float), np.asarray(c, dtype=np.int64))
+
+    # A handful of scenarios is faster as plain float loops than as per-step array updates
+    if a.size <= SCALAR_ERLANG_LIMIT:
+        result = np.empty(a.shape)
+        for index, (load, servers) in enumerate(zip(a.ravel().tolist(), c.ravel().tolist())):
+            b = 1.0
+            for n in range(1, servers + 1):
+                b = load * b / (n + load * b)
+            result.flat[index] = b
+        return result
+
+    # Sort by server count so step n only updates the scenarios that still have c >= n
+    order = np.argsort(c, axis=None)
+    load = a.ravel()[order]
+    servers = c.ravel()[order]
+    b = np.ones(load.shape)
+    for n in range(1, int(servers[-1]) + 1 if servers.size else 1):
+        first = np.searchsorted(servers, n)
+        ab = load[first:] * b[first:]
+        b[first:] = ab / (n + ab)
+    result = np.empty(b.shape)
+    result[order] = b
+    return result.reshape(a.shape)
+
+
+# Function to calculate Erlang C (probability that an arrival has to wait) for arrays of a and c
+def erlang_c(a, c):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        b = erlang_b(a, c)
+        return b / (1 - (np.asarray(a) / np.asarray(c)) * (1 - b))
+
+
+# Function to calculate log(n!) for an array of non-negative integers
+def _log_factorial(n):
+    n = np.asarray(n, dtype=np.int64)
+    table = np.concatenate([[0.0], np.cumsum(np.log(np.arange(1, int(n.max()) + 1 if n.size else 1)))])
+    return table[n]
+
+
+# Function to calculate P0 of an M/M/c-type system and the product P0 * a**c / c!, in log space.
+# With Q = gammaincc(c, a) = e**-a sum(a**n / n! for n < c) and pmf = e**-a a**c / c!,
+# P0 = e**-a / (Q + pmf / (1 - rho)), so neither a**c nor c! is ever formed and P0 stays accurate for a << c
+def p0(a, c, rho, epsilon=0.0):
+    from scipy.special import gammaincc  # scipy is loaded on first use
+
+    a, c = np.asarray(a, dtype=float), np.asarray(c, dtype=np.int64)
+    log_power = c * np.log(a) - _log_factorial(c)  # log(a**c / c!)
+    log_denominator = np.log(gammaincc(c, a) + np.exp(log_power - a) / (1 - rho + epsilon))
+    log_P0 = -a - log_denominator
+    return np.exp(log_P0), np.exp(log_P0 + log_power)
+
+
+# Function to calculate the mean and variance of normal service times
+def normal_statistics(service_mean, service_stddev):
+    return np.asarray(service_mean, dtype=float), np.asarray(service_stddev, dtype=float) ** 2
+
+
+# Function to calculate the mean and variance of uniform service times
+def uniform_statistics(service_min, service_max):
+    service_min, service_max = np.asarray(service_min, dtype=float), np.asarray(service_max, dtype=float)
+    return (service_min + service_max) / 2, (service_max - service_min) ** 2 / 12
+
+
+# M/M/S metrics for arrays of arrival rates, service rates and server counts
+def mms_metrics(arrival_rate, service_rate, servers):
+    arrival, service, servers = np.broadcast_arrays(
+        np.asarray(arrival_rate, dtype=float), np.asarray(service_rate, dtype=float), np.asarray(servers, dtype=np.int64))
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        rho = arrival / (servers * service)
+        P0, scaled = p0(servers * rho, servers, rho)
+        Lq = (scaled * rho) / ((1 - rho) ** 2)
+        L = Lq + (arrival / service)
+        W = L / arrival
+        Wq = Lq / arrival
+    return _results(MMS_FIELDS, [rho, P0, Lq, L, W, Wq], rho < 1)
+
+
+# M/G/S metrics for arrays of arrival rates, server counts and service-time means and variances
+def mgs_metrics(arrival_rate, servers, service_mean, service_variance):
+    arrival, servers, mean, variance = np.broadcast_arrays(
+        np.asarray(arrival_rate, dtype=float), np.asarray(servers, dtype=np.int64),
+        np.asarray(service_mean, dtype=float), np.asarray(service_variance, dtype=float))
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        service = 1 / mean
+        rho = arrival / (servers * service)
+        P0, scaled = p0(arrival / service, servers, rho)
+        coefficient_of_variation_squared = variance / mean ** 2
+        Lq = np.where(
+            servers > 1,
+            scaled / (1 - rho) ** 2 * rho * (1 + coefficient_of_variation_squared),
+            (arrival ** 2 * variance) + rho ** 2 / (2 * (1 - rho)),
+        )
+        L = Lq + (arrival / service)
+        Wq = Lq / arrival
+        W = Wq + (1 / service)
+    return _results(MGS_FIELDS, [P0, rho, Lq, L, Wq, W], rho < 1)
+
+
+# G/G/S metrics for arrays of inter-arrival means, service means, server counts and their variances
+def ggs_metrics(arrival_mean, service_mean, servers, arrival_variance, service_variance):
+    arrival_mean, service_mean, c, arrival_variance, service_variance = np.broadcast_arrays(
+        np.asarray(arrival_mean, dtype=float), np.asarray(service_mean, dtype=float),
+        np.asarray(servers, dtype=np.int64), np.asarray(arrival_variance, dtype=float),
+        np.asarray(service_variance, dtype=float))
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        lembda = 1 / arrival_mean
+        meu = 1 / service_mean
+        p = lembda / (c * meu)  # Utilization factor
+
+        Ca = arrival_variance / ((1 / lembda) ** 2)  # Coefficient of variation for arrivals
+        Cs = service_variance / ((1 / meu) ** 2)  # Coefficient of variation for services
+
+        # Epsilons avoid division by zero, as on the calculator page
+        Pnot, scaled = p0(c * p, c, p, epsilon=1e-10)
+
+        Lq = (scaled * p) / ((1 - p) ** 2 + 1e-10)
+        Wq = Lq / lembda
+        Wq *= (Ca + Cs) / 2  # Adjusted for variability
+        Lq = lembda * Wq
+        Ws = Wq + (1 / meu)
+        Ls = Ws * lembda
+    return _results(GGS_FIELDS, [Lq, Wq, Ws, Ls, Pnot], p < 1)
@@ -0,0 +1,51 @@
+import numpy as np
+from modules.dispatch import dispatch
+from modules.engine import result_columns
+from modules.streaming import summarize_chunks
+
+# Columns of the bank workbook that hold the recorded times
+INTER_ARRIVAL_COLUMN = "INTER-ARRIVAL TIME(MIN)"
+SERVICE_COLUMN = "SERVICE TIME (MIN)"
+
+
+# Function to check recorded times and turn them into arrays (times cannot be negative or missing)
+def _trace_arrays(inter_arrival, service):
+    inter_arrival = np.asarray(inter_arrival)
+    service = np.asarray(service)
+    if len(inter_arrival) != len(service):
+        raise ValueError("The trace needs one service time per inter-arrival time.")
+    for name, values in (("inter-arrival", inter_arrival), ("service", service)):
+        if values.dtype.kind == "f" and np.isnan(values).any():
+            raise ValueError(f"The trace has missing {name} times.")
+        if values.size and values.min() < 0:
+            raise ValueError(f"The trace has negative {name} times.")
+    return inter_arrival, service
+
+
+# Function to replay recorded inter-arrival and service times through num_servers servers.
+# The recorded customers are served as logged, only the number of servers changes ("what if we had s servers").
+def replay(inter_arrival, service, num_servers):
+    inter_arrival, service = _trace_arrays(inter_arrival, service)
+    arrival = np.cumsum(inter_arrival)
+    server, start, end = dispatch(arrival, service, num_servers)
+    return result_columns(inter_arrival, arrival, service, server, start, end)
+
+
+# Generator reading a recorded trace from a CSV or Parquet file as (inter-arrival, arrival, service) chunks
+def trace_chunks(path, inter_arrival_column=INTER_ARRIVAL_COLUMN, service_column=SERVICE_COLUMN, chunk_size=1_000_000):
+    from modules.dataset import read_chunks
+
+    clock = 0
+    for chunk in read_chunks(path, [inter_arrival_column, service_column], chunk_size):
+        inter_arrival, service = _trace_arrays(chunk[inter_arrival_column].to_numpy(), chunk[service_column].to_numpy())
+        if len(inter_arrival) == 0:
+            continue
+        arrival = clock + np.cumsum(inter_arrival)
+        clock = arrival[-1]
+        yield inter_arrival, arrival, service
+
+
+# Function to replay a trace file of any length in bounded memory, keeping only running statistics
+def replay_file(path, num_servers, inter_arrival_column=INTER_ARRIVAL_COLUMN, service_column=SERVICE_COLUMN,
+                chunk_size=1_000_000):
+    return summarize_chunks(trace_chunks(path, inter_arrival_column, service_column, chunk_size), num_servers)
@@ -0,0 +1,41 @@
+import math
+import numpy as np
+from modules.quantiles import PERCENTILE_METRICS
+from modules.streaming import stream_simulation, STREAM_METRICS
+
+
+# Function to run one replication on its own random stream and return the metric averages
+# with the quantile sketches of its wait, turnaround and response times
+def run_replication(model, params, num_servers, seed, num_customers=None, horizon=None):
+    rng = np.random.default_rng(seed)
+    summary = stream_simulation(model, params, num_servers, num_customers=num_customers, horizon=horizon, rng=rng)
+    means = {metric: summary["Stats"][metric].mean for metric in STREAM_METRICS}
+    means["Overall Utilization"] = summary["Overall Utilization"]
+    return means, summary["Sketches"]
+
+
+# Function to calculate the mean and confidence interval of every metric across replications
+def confidence_intervals(results, confidence=0.95):
+    from scipy.stats import t  # scipy takes about a second to import, so load it on first use
+
+    count = len(results)
+    quantile = t.ppf((1 + confidence) / 2, count - 1) if count > 1 else math.nan
+    summary = {}
+    for metric in results[0]:
+        values = np.array([result[metric] for result in results], dtype=float)
+        mean = values.mean()
+        half_width = quantile * values.std(ddof=1) / math.sqrt(count) if count > 1 else math.nan
+        summary[metric] = {"Mean": mean, "Lower": mean - half_width, "Upper": mean + half_width}
+    return summary
+
+
+# Function to combine the (means, sketches) results of the replications into the means with their confidence
+# intervals, and the percentiles (P50, P95, ...) over the customers of all replications by merging their sketches
+def summarize_replications(results, confidence=0.95):
+    summary = confidence_intervals([means for means, _ in results], confidence)
+    for metric in PERCENTILE_METRICS:
+        pooled = results[0][1][metric]
+        for _, sketches in results[1:]:
+            pooled.merge(sketches[metric])
+        summary[metric].update({f"P{p}": value for p, value in pooled.percentiles().items()})
+    return summary
@@ -0,0 +1,138 @@
+import hashlib
+import json
+import os
+import time
+import zipfile
+import numpy as np
+from modules.cache_files import remove_file, write_atomic
+from modules.engine import ENGINE_VERSION, dispatch_customers, sample_customers, simulate
+from modules.lru import LRUCache
+
+# Anchored to the repository, so runs launched from any directory share one store
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", ".cache", "results")
+
+# Size the stored results may reach before the least recently used ones are deleted
+RESULTS_MAX_BYTES = 1024 ** 3
+
+# Temporary files left behind by writers that died are deleted once they are this many seconds old
+STALE_TEMP_SECONDS = 3600
+
+# Sampled customer streams kept in memory (least recently used are dropped first), so a run that
+# differs only in its server count re-runs just the dispatch, on the same customers
+STREAM_CACHE_SIZE = 8
+_stream_cache = LRUCache(STREAM_CACHE_SIZE)
+
+
+# Function to make a parameter hashable: scalars as floats, arrays (e.g. observed data) by their content
+def _param_value(value):
+    if np.ndim(value) == 0:
+        return float(value)
+    values = np.ascontiguousarray(value)
+    return f"{values.dtype.str}{values.shape}:{hashlib.sha256(values.tobytes()).hexdigest()}"
+
+
+# Function to hash a scenario description into a content address
+def _digest(scenario):
+    return hashlib.sha256(json.dumps(scenario, sort_keys=True).encode()).hexdigest()
+
+
+# Function to build the content address of a run's customer streams (everything except the server count)
+def stream_key(model, params, num_customers, seed):
+    return _digest({
+        "engine": ENGINE_VERSION,
+        "model": model,
+        "params": {name: _param_value(value) for name, value in params.items()},
+        "customers": int(num_customers),
+        "seed": int(seed),
+    })
+
+
+# Function to build the content address of a run from everything that determines its output
+def result_key(model, params, num_servers, num_customers, seed):
+    return _digest({"streams": stream_key(model, params, num_customers, seed), "servers": int(num_servers)})
+
+
+# Function to read stored result columns, or None when the run is not stored.
+# A truncated or corrupt file counts as a miss and is deleted, so the next run stores it again.
+def load_result(key, cache_dir=RESULTS_DIR):
+    path = os.path.join(cache_dir, f"{key}.npz")
+    try:
+        with np.load(path) as stored:
+            columns = {name: stored[name] for name in stored.files}
+        os.utime(path)  # Mark the run as recently used, so pruning keeps it
+        return columns
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+        remove_file(path)
+        return None
+
+
+# Function to store result columns, writing to a temporary file first so readers never see a partial file,
+# then to prune the store back to max_bytes
+def save_result(key, columns, cache_dir=RESULTS_DIR, max_bytes=RESULTS_MAX_BYTES):
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        write_atomic(os.path.join(cache_dir, f"{key}.npz"), lambda file: np.savez(file, **columns))
+    except OSError:
+        return  # A read-only or full disk only costs the reuse, not the run
+    prune_results(cache_dir, max_bytes)
+
+
+# Function to delete the least recently used results (by modification time, which a hit refreshes) until the
+# store holds at most max_bytes. Entries of older engine versions or key schemes are never hit again, so they go first.
+def prune_results(cache_dir=RESULTS_DIR, max_bytes=RESULTS_MAX_BYTES):
+    entries = []
+    now = time.time()
+    try:
+        with os.scandir(cache_dir) as scan:
+            for entry in scan:
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                if entry.name.endswith(".npz"):
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                elif entry.name.endswith(".tmp") and now - stat.st_mtime > STALE_TEMP_SECONDS:
+                    remove_file(entry.path)
+    except OSError:
+        return
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        remove_file(path)
+        total -= size
+
+
+# Function to draw a seeded run's customer streams, reusing them while they stay in the stream cache
+def customer_streams(model, params, num_customers, seed):
+    key = stream_key(model, params, num_customers, seed)
+    streams = _stream_cache.get(key)
+    if streams is not None:
+        return streams
+
+    streams = sample_customers(model, params, num_customers, np.random.default_rng(seed))
+    for values in streams:
+        values.flags.writeable = False  # Shared between runs, so nobody may modify them
+    _stream_cache.put(key, streams)
+    return streams
+
+
+# Function to run a seeded simulation, serving it from the result store when the same run was done before.
+# Runs with the same seed share their customers whatever the server count (common random numbers).
+# Without a seed the run draws fresh randomness and is neither looked up nor stored; with cache_dir=None
+# it is computed from the seed without touching the disk.
+def cached_simulation(model, params, num_servers, num_customers, seed=None, cache_dir=RESULTS_DIR):
+    if seed is None:
+        return simulate(model, params, num_servers, num_customers, np.random.default_rng())
+    if cache_dir is None:
+        return dispatch_customers(*customer_streams(model, params, num_customers, seed), num_servers)
+
+    key = result_key(model, params, num_servers, num_customers, seed)
+    columns = load_result(key, cache_dir)
+    if columns is None:
+        columns = dispatch_customers(*customer_streams(model, params, num_customers, seed), num_servers)
+        save_result(key, columns, cache_dir)
+    return columns
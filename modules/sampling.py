@@ -0,0 +1,122 @@
+from functools import lru_cache
+import numpy as np
+
+# Number of cumulative probability tables kept in memory (least recently used are dropped first)
+TABLE_CACHE_SIZE = 128
+
+
+# Function to freeze a cached table so callers cannot modify the shared copy
+def _read_only(values):
+    values.flags.writeable = False
+    return values
+
+
+# Function to build the Poisson cumulative probability table in one vectorized call.
+# Without num_entries the table stops at the first entry reaching the threshold (at most max_entries long).
+@lru_cache(maxsize=TABLE_CACHE_SIZE)
+def poisson_cp_table(lambda_rate, num_entries=None, threshold=0.9999, max_entries=500):
+    from scipy.stats import poisson  # scipy takes about a second to import, so load it on first use
+
+    size = num_entries if num_entries is not None else max_entries
+    cp_values = poisson.cdf(np.arange(size), lambda_rate)
+    if num_entries is None:
+        reached = np.flatnonzero(cp_values >= threshold)
+        if reached.size:
+            cp_values = cp_values[:reached[0] + 1]
+    return _read_only(cp_values)
+
+
+# Function to build a 4-decimal cumulative probability table over 0, 1, 2, ... that ends at the first 1.0000
+def _rounded_cp_table(cdf, size):
+    while True:
+        cp_values = np.round(cdf(np.arange(size)), 4)
+        reached = np.flatnonzero(cp_values >= 1)
+        if reached.size:
+            return _read_only(cp_values[:reached[0] + 1])
+        size *= 2
+
+
+# Function to build the 4-decimal Poisson table used by the M/G/S simulator
+@lru_cache(maxsize=TABLE_CACHE_SIZE)
+def rounded_poisson_cp_table(lambda_rate):
+    from scipy.stats import poisson
+
+    return _rounded_cp_table(lambda x: poisson.cdf(x, lambda_rate), max(16, int(2 * lambda_rate) + 16))
+
+
+# Function to build the 4-decimal Normal table used by the G/G/S simulator
+@lru_cache(maxsize=TABLE_CACHE_SIZE)
+def rounded_normal_cp_table(mean, std):
+    from scipy.stats import norm
+
+    return _rounded_cp_table(lambda x: norm.cdf(x, mean, std), max(16, int(mean + 6 * std) + 1))
+
+
+# Function to map uniform random numbers onto a cumulative probability table
+# (index of the first entry whose cumulative probability exceeds the number)
+def inverse_cdf(cp_values, uniforms, side="right"):
+    cp_values = np.asarray(cp_values, dtype=float)
+    index = np.searchsorted(cp_values, uniforms, side=side)
+    return np.minimum(index, len(cp_values) - 1)
+
+
+# Function to draw a batch of inter-arrival times from a cumulative probability table
+def sample_inter_arrivals(cp_values, size, rng=None, side="right"):
+    rng = np.random if rng is None else rng
+    inter_arrival = np.zeros(size, dtype=np.int64)  # First customer arrives at time 0
+    if size > 1:
+        inter_arrival[1:] = inverse_cdf(cp_values, rng.random(size - 1), side=side)
+    return inter_arrival
+
+
+# Function to draw a batch of exponential service times (rounded up to whole minutes)
+def sample_service_times(mean, size, rng=None):
+    rng = np.random if rng is None else rng
+    return np.ceil(-mean * np.log(rng.random(size))).astype(np.int64)
+
+
+# Function to turn inter-arrival times into arrival times
+def arrival_times(inter_arrival):
+    return np.cumsum(inter_arrival)
+
+
+# Function to build a Walker alias table (Vose's method) for any discrete distribution, so that each
+# draw costs one uniform index and one uniform coin flip however many outcomes the table has
+def alias_table(weights):
+    weights = np.asarray(weights, dtype=float)
+    if weights.ndim != 1 or weights.size == 0 or (weights < 0).any() or weights.sum() <= 0:
+        raise ValueError("An alias table needs a non-empty list of non-negative weights with a positive sum.")
+    scaled = weights * (weights.size / weights.sum())
+    prob = np.ones(weights.size)
+    alias = np.arange(weights.size)
+
+    small = [i for i in range(weights.size) if scaled[i] < 1]
+    large = [i for i in range(weights.size) if scaled[i] >= 1]
+    while small and large:
+        less, more = small.pop(), large[-1]
+        prob[less] = scaled[less]
+        alias[less] = more
+        scaled[more] -= 1 - scaled[less]
+        if scaled[more] < 1:
+            small.append(large.pop())
+    return _read_only(prob), _read_only(alias)  # Leftover entries keep probability 1 (rounding residue)
+
+
+# Function to draw a batch of outcome indices from an alias table
+def sample_alias(prob, alias, size, rng=None):
+    rng = np.random if rng is None else rng
+    index = rng.integers(0, len(prob), size) if hasattr(rng, "integers") else rng.randint(0, len(prob), size)
+    return np.where(rng.random(size) < prob[index], index, alias[index])
+
+
+# Function to build an alias table from observed values: the outcomes are the distinct values,
+# weighted by how often each was observed. Returns (values, prob, alias).
+def empirical_alias_table(observed):
+    values, counts = np.unique(np.asarray(observed), return_counts=True)
+    return (_read_only(values), *alias_table(counts))
+
+
+# Function to draw a batch of values from the empirical distribution of the observed values
+def sample_empirical(table, size, rng=None):
+    values, prob, alias = table
+    return values[sample_alias(prob, alias, size, rng)]
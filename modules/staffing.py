@@ -0,0 +1,84 @@
+import hashlib
+import numpy as np
+from modules.lru import LRUCache
+from modules.queuing import erlang_c, ggs_metrics, mms_metrics
+
+# Wait-time evaluations kept between calls (least recently used are dropped first)
+EVALUATION_CACHE_SIZE = 256
+_evaluation_cache = LRUCache(EVALUATION_CACHE_SIZE)
+
+# Parameters each model needs: M/M/S takes rates, G/G/S takes the means and variances GGC uses
+MODEL_PARAMS = {
+    "mms": ["arrival_rate", "service_rate"],
+    "ggs": ["arrival_mean", "service_mean", "arrival_variance", "service_variance"],
+}
+
+
+# Function to calculate the offered load (arrival rate / service rate) of every scenario
+def offered_load(model, params):
+    if model == "mms":
+        return params["arrival_rate"] / params["service_rate"]
+    return params["service_mean"] / params["arrival_mean"]
+
+
+# Function to evaluate the target metric ("wait" for Wq, "probability" for P(wait)) at c servers.
+# Unstable scenarios give NaN, which never meets a target.
+# P(wait) is Erlang C for both models: the Allen-Cunneen factor (Ca² + Cs²) / 2 of G/G/S scales the
+# mean wait, not the chance of waiting, so the probability target treats a G/G/S scenario as M/M/S.
+def evaluate(model, target, servers, params):
+    key = hashlib.sha1(f"{model}{target}".encode())
+    for values in [servers] + [params[name] for name in MODEL_PARAMS[model]]:
+        key.update(np.ascontiguousarray(values).tobytes())
+    key = key.hexdigest()
+    metric = _evaluation_cache.get(key)
+    if metric is not None:
+        return metric
+
+    if target == "probability":
+        a = offered_load(model, params)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            metric = np.where(a < servers, erlang_c(a, servers), np.nan)
+    elif model == "mms":
+        metric = mms_metrics(params["arrival_rate"], params["service_rate"], servers).Wq
+    else:
+        metric = ggs_metrics(params["arrival_mean"], params["service_mean"], servers,
+                             params["arrival_variance"], params["service_variance"]).Wq
+
+    _evaluation_cache.put(key, metric)
+    return metric
+
+
+# Function to find the minimum number of servers that meets the target for every scenario at once.
+# Both Wq and P(wait) fall as servers are added, so each scenario gallops up from its stability
+# limit and then bisects. Scenarios that cannot meet the target within max_servers give -1.
+def min_servers(model, target, limit, max_servers=100000, **params):
+    names = MODEL_PARAMS[model]
+    arrays = np.broadcast_arrays(*[np.asarray(params[name], dtype=float) for name in names],
+                                 np.asarray(limit, dtype=float))
+    params = {name: np.ascontiguousarray(values) for name, values in zip(names, arrays[:-1])}
+    limit = arrays[-1]
+    if (limit <= 0).any():
+        # Wq and P(wait) only reach 0 by underflowing, so a target of 0 would return an arbitrary server count
+        raise ValueError("The target must be greater than 0.")
+
+    def feasible(servers):
+        return evaluate(model, target, servers, params) <= limit
+
+    # Below the offered load the queue is unstable, so floor(a) servers never meets a target
+    lo = np.minimum(np.floor(offered_load(model, params)).astype(np.int64), max_servers)
+    step = np.ones(lo.shape, dtype=np.int64)
+    hi = np.minimum(lo + 1, max_servers)
+    done = feasible(hi) | (hi >= max_servers)
+    while not done.all():
+        lo = np.where(done, lo, hi)
+        step = np.where(done, step, step * 2)
+        hi = np.where(done, hi, np.minimum(lo + step, max_servers))
+        done = feasible(hi) | (hi >= max_servers)
+
+    while (hi - lo > 1).any():
+        mid = (lo + hi) // 2
+        meets = feasible(mid)
+        hi = np.where(meets, mid, hi)
+        lo = np.where(meets, lo, mid)
+
+    return np.where(feasible(hi), hi, -1)
@@ -0,0 +1,111 @@
+import numpy as np
+from modules.models import MODELS
+from modules.dispatch import dispatch, queue_metrics, server_heap
+from modules.quantiles import PERCENTILE_METRICS, QuantileSketch
+
+# Metrics kept as running aggregates in a long-run simulation
+STREAM_METRICS = ["Inter Arrival Time", "Service Time", "Turn Around Time", "Wait Time", "Response Time"]
+
+
+# Running mean and variance (Welford), updated one chunk of values at a time
+class RunningStats:
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        if values.size == 0:
+            return
+        mean = values.mean()
+        self._combine(values.size, mean, np.sum((values - mean) ** 2))
+
+    def merge(self, other):
+        if other.count:
+            self._combine(other.count, other.mean, other.m2)
+
+    def _combine(self, count, mean, m2):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta ** 2 * self.count * count / total
+        self.count = total
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return self.variance ** 0.5
+
+
+# Generator yielding (inter-arrival, arrival, service) chunks until the customer count or time horizon is reached
+def customer_chunks(model, params, num_customers=None, horizon=None, chunk_size=100_000, rng=None):
+    if num_customers is None and horizon is None:
+        raise ValueError("Either the number of customers or the time horizon must be given.")
+    rng = np.random if rng is None else rng
+    inter_arrival_sampler, service_sampler = MODELS[model](**params)
+
+    produced = 0
+    clock = 0
+    while num_customers is None or produced < num_customers:
+        size = chunk_size if num_customers is None else min(chunk_size, num_customers - produced)
+        inter_arrival = inter_arrival_sampler(size, rng)
+        if produced == 0:
+            inter_arrival[0] = 0  # First customer arrives at time 0
+        arrival = clock + np.cumsum(inter_arrival)
+        service = service_sampler(size, rng)
+
+        if horizon is not None and arrival[-1] > horizon:
+            keep = np.searchsorted(arrival, horizon, side="right")
+            if keep:
+                yield inter_arrival[:keep], arrival[:keep], service[:keep]
+            return
+
+        clock = arrival[-1]
+        produced += size
+        yield inter_arrival, arrival, service
+
+
+# Generator assigning servers to each chunk, carrying the server heap across chunks
+def dispatched_chunks(chunks, num_servers):
+    heap = server_heap(num_servers)
+    for inter_arrival, arrival, service in chunks:
+        server, start, end = dispatch(arrival, service, num_servers, heap=heap)
+        yield inter_arrival, arrival, service, server, start, end
+
+
+# Function to reduce (inter-arrival, arrival, service) chunks to running statistics in bounded memory
+def summarize_chunks(chunks, num_servers):
+    stats = {metric: RunningStats() for metric in STREAM_METRICS}
+    sketches = {metric: QuantileSketch() for metric in PERCENTILE_METRICS}
+    busy_time = np.zeros(num_servers)
+    last_end = 0
+
+    for inter_arrival, arrival, service, server, start, end in dispatched_chunks(chunks, num_servers):
+        turn_around, wait, response = queue_metrics(arrival, service, start, end)
+        for metric, values in zip(STREAM_METRICS, (inter_arrival, service, turn_around, wait, response)):
+            stats[metric].update(values)
+            if metric in sketches:
+                sketches[metric].update(values)
+        busy_time += np.bincount(server, weights=service, minlength=num_servers)
+        last_end = max(last_end, end.max())
+
+    # Utilization is busy time over the elapsed time until the last customer leaves
+    server_util = busy_time / last_end if last_end else busy_time
+    return {
+        "Customers": stats["Service Time"].count,
+        "Elapsed Time": last_end,
+        "Stats": stats,
+        "Sketches": sketches,
+        "Server Utilization": server_util,
+        "Overall Utilization": float(np.mean(server_util)),
+    }
+
+
+# Function to run a long simulation in bounded memory, keeping only running statistics
+def stream_simulation(model, params, num_servers, num_customers=None, horizon=None, chunk_size=100_000, rng=None):
+    chunks = customer_chunks(model, params, num_customers, horizon, chunk_size, rng)
+    return summarize_chunks(chunks, num_servers)
@@ -0,0 +1,74 @@
+import numpy as np
+
+
+# Function to sweep the arrival, start and end events of a run into step functions of time.
+# Each returned value holds from its time until the next one (all events at the same time are applied together).
+# Returns (times, number in system, queue length, busy servers); O(n log n) from one sort of 3n events.
+def occupancy_timeline(arrival, start, end):
+    arrival, start, end = (np.asarray(values) for values in (arrival, start, end))
+    n = len(arrival)
+    times = np.concatenate([arrival, start, end])
+    in_system = np.concatenate([np.ones(n, np.int64), np.zeros(n, np.int64), -np.ones(n, np.int64)])
+    busy = np.concatenate([np.zeros(n, np.int64), np.ones(n, np.int64), -np.ones(n, np.int64)])
+
+    order = np.argsort(times, kind="stable")
+    times = times[order]
+    first = np.flatnonzero(np.r_[True, times[1:] != times[:-1]]) if n else np.zeros(0, dtype=np.int64)
+    number_in_system = np.cumsum(np.add.reduceat(in_system[order], first)) if n else np.zeros(0, np.int64)
+    busy_servers = np.cumsum(np.add.reduceat(busy[order], first)) if n else np.zeros(0, np.int64)
+    return times[first], number_in_system, number_in_system - busy_servers, busy_servers
+
+
+# Function to calculate the time-weighted average of a step function over [times[0], until]
+def time_average(times, values, until=None):
+    if len(times) == 0:
+        return 0.0
+    until = times[-1] if until is None else until
+    durations = np.diff(np.append(times, until))
+    total = until - times[0]
+    return float(np.dot(values, durations) / total) if total > 0 else float(values[-1])
+
+
+# Function to calculate the time-weighted metrics of a run over its horizon (time 0 to the last departure):
+# true L and Lq, the average number of busy servers and the utilization of every server
+def time_weighted_metrics(columns, num_servers):
+    end = np.asarray(columns["End Time"])
+    horizon = float(end.max()) if len(end) else 0.0
+    times, in_system, queue, busy = occupancy_timeline(columns["Arrival Time"], columns["Start Time"], end)
+    times, in_system, queue, busy = (np.append(0, values) for values in (times, in_system, queue, busy))
+
+    busy_time = np.bincount(np.asarray(columns["Server"]), weights=np.asarray(columns["Service Time"], dtype=float),
+                            minlength=num_servers)
+    server_util = busy_time / horizon if horizon else busy_time
+    return {
+        "L": time_average(times, in_system, horizon),
+        "Lq": time_average(times, queue, horizon),
+        "Busy Servers": time_average(times, busy, horizon),
+        "Server Utilization": server_util,
+        "Overall Utilization": float(server_util.mean()) if num_servers else 0.0,
+    }
+
+
+# Function to reduce a step function to at most num_bins equal time buckets for plotting.
+# Each bucket keeps the minimum, maximum and time-weighted mean the function takes inside it.
+def step_aggregates(times, values, num_bins):
+    times = np.asarray(times, dtype=float)
+    values = np.asarray(values, dtype=float)
+    edges = np.linspace(times[0], times[-1], num_bins + 1)
+
+    # Value in force at each bucket's left edge, then the events strictly inside each bucket
+    carried = values[np.searchsorted(times, edges[:-1], side="right") - 1]
+    inside = np.searchsorted(times, edges, side="right")
+    low, high = carried.copy(), carried.copy()
+    has_events = inside[1:] > inside[:-1]
+    starts = inside[:-1][has_events]
+    if starts.size:
+        low[has_events] = np.minimum(low[has_events], np.minimum.reduceat(values, starts))
+        high[has_events] = np.maximum(high[has_events], np.maximum.reduceat(values, starts))
+
+    # Time-weighted mean from the running integral of the step function, read off at the bucket edges
+    area = np.concatenate([[0.0], np.cumsum(values[:-1] * np.diff(times))])
+    index = np.searchsorted(times, edges, side="right") - 1
+    integral = area[index] + values[index] * (edges - times[index])
+    mean = np.diff(integral) / np.diff(edges)
+    return edges, low, high, mean
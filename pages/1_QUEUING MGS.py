@@ -1,5 +1,5 @@
-import math
 import streamlit as st
+from modules.queuing import MGS_FIELDS, mgs_metrics, normal_statistics, uniform_statistics
 
 
 st.set_page_config(
@@ -10,57 +10,20 @@ st.set_page_config(
 )
 
 
-# Functions from your script
-def get_normal_statistics(service_mean, service_stddev):
-    service_variance = service_stddev ** 2
-    return service_mean, service_variance
-
-def get_uniform_statistics(service_min, service_max):
-    service_mean = (service_min + service_max) / 2
-    service_variance = ((service_max - service_min) ** 2) / 12
-    return service_mean, service_variance
-
-def calculate_utilization(arrival_rate, service_rate, num_servers):
-    return arrival_rate / (num_servers * service_rate)
-
-def calculate_P0(arrival_rate, service_rate, rho, num_servers):
-    try:
-        # If service_rate or (1 - rho) is zero, it will raise a ZeroDivisionError
-        sum_term = sum([(arrival_rate / service_rate) ** n / math.factorial(n) for n in range(num_servers)])
-        P0 = (sum_term + (arrival_rate / service_rate) ** num_servers / math.factorial(num_servers) * 1 / (1 - rho)) ** (-1)
-        return P0
-    except ZeroDivisionError:
-        st.error("Error: Division by zero occurred. Please check the service rate and arrival rate values.")
-        return None
-
+# Functions from your script (the formulas live in modules/queuing.py)
 def calculate_performance_metrics_variance(arrival_rate, num_servers, distribution, **params):
     if distribution == 'normal':
-        service_mean, service_variance = get_normal_statistics(**params)
+        service_mean, service_variance = normal_statistics(**params)
     elif distribution == "uniform":
-        service_mean, service_variance = get_uniform_statistics(**params)
+        service_mean, service_variance = uniform_statistics(**params)
     else:
         st.error("Invalid distribution choice! Please choose either 'normal' or 'uniform'.")
         return
 
-    service_rate = 1 / service_mean
-    rho = calculate_utilization(arrival_rate, service_rate, num_servers)
-    if rho >= 1:
+    result = mgs_metrics(arrival_rate, num_servers, service_mean, service_variance)[0]
+    if not result.stable:
         return "Error: Utilization (ρ) must be less than 1."
-    P0 = calculate_P0(arrival_rate, service_rate, rho, num_servers)
-    if P0:
-        if num_servers > 1:
-            coefficient_of_variation_squared = service_variance / service_mean**2
-            Lq = (P0 * ((arrival_rate / service_rate) ** num_servers) / 
-                (math.factorial(num_servers) * (1 - rho)**2) * 
-                rho * (1 + coefficient_of_variation_squared))
-        else:
-            Lq = (arrival_rate ** 2 * service_variance) + rho**2 / (2 * (1 - rho))
-    
-        L = Lq + (arrival_rate / service_rate)
-        Wq = Lq / arrival_rate
-        W = Wq + (1 / service_rate)
-        
-        return P0, rho, Lq, L, Wq, W
+    return tuple(float(result[field]) for field in MGS_FIELDS)
 
 # Streamlit UI
 st.title("M/G/S Queuing Model")
@@ -85,7 +48,7 @@ elif distribution == "uniform":
     params = {"service_min": service_min, "service_max": service_max}
 
 
-num_servers = st.number_input("Number of Servers (c)", min_value=1, max_value=50, step=1, value=2)
+num_servers = st.number_input("Number of Servers (c)", min_value=1, max_value=100000, step=1, value=2)
 # Calculate and Display Results
 if st.button("Calculate Metrics"):
     results = calculate_performance_metrics_variance(arrival_rate, num_servers, distribution, **params)
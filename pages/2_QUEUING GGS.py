@@ -1,5 +1,5 @@
-import math
 import streamlit as st
+from modules.queuing import GGS_FIELDS, ggs_metrics
 
 
 st.set_page_config(
@@ -13,40 +13,19 @@ st.title("G/G/S Queuing Model")
 
 # Function to calculate G/G/S metrics
 def GGC(Arrival_Mean, Service_Mean, No_of_server, ArrivalVariance, ServiceVariance):
-    lembda = 1 / Arrival_Mean
-    meu = 1 / Service_Mean
-    c = No_of_server
-    p = lembda / (c * meu)  # Utilization factor
+    result = ggs_metrics(Arrival_Mean, Service_Mean, No_of_server, ArrivalVariance, ServiceVariance)[0]
 
-    if p >= 1:
+    if not result.stable:
         raise ValueError("The system is unstable (utilization factor p >= 1). Please adjust your inputs.")
 
-    Ca = ArrivalVariance / ((1 / lembda) ** 2)  # Coefficient of variation for arrivals
-    Cs = ServiceVariance / ((1 / meu) ** 2)  # Coefficient of variation for services
-
-    # Calculating P0
-    value = 0
-    for m in range(c):
-        value += ((c * p) ** m) / math.factorial(m)
-    value += ((c * p) ** c) / (math.factorial(c) * (1 - p + 1e-10))  # Add epsilon to avoid division by zero
-    Pnot = 1 / value
-
-    # Calculating queue length and waiting times
-    Lq = (Pnot * p * (lembda / meu) ** c) / (math.factorial(c) * ((1 - p) ** 2 + 1e-10))  # Add epsilon
-    Wq = Lq / lembda
-    Wq *= (Ca + Cs) / 2  # Adjusted for variability
-    Lq = lembda * Wq
-    Ws = Wq + (1 / meu)
-    Ls = Ws * lembda
-
-    return Lq, Wq, Ws, Ls, Pnot
+    return tuple(float(result[field]) for field in GGS_FIELDS)
 
 # User input fields with default values
 Arrival_Mean = st.number_input("Mean Arrival Rate", min_value=0.01, step=0.1, value=1.0, format="%.2f")
 Service_Mean = st.number_input("Mean Service Rate", min_value=0.01, step=0.1, value=1.0, format="%.2f")
 ArrivalVariance = st.number_input("Arrival Variance", min_value=0.01, step=1.0, value=1.0)
 ServiceVariance = st.number_input("Service Variance", min_value=0.01, step=1.0, value=1.0)
-No_of_server = st.number_input("Number of Servers", min_value=1, max_value=50, step=1, value=3)
+No_of_server = st.number_input("Number of Servers", min_value=1, max_value=100000, step=1, value=3)
 
 # Button to calculate metrics
 if st.button("Calculate Metrics"):
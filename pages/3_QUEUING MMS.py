@@ -1,5 +1,5 @@
-import math
 import streamlit as st
+from modules.queuing import MMS_FIELDS, mms_metrics
 
 st.set_page_config(
     page_title="M/M/S Queuing Calculator", 
@@ -18,24 +18,13 @@ def calculate_mms_metrics(arrival, service, servers, rate=False):
         arrival = 1 / arrival
         service = 1 / service
 
-    rho = arrival / (servers * service)
+    result = mms_metrics(arrival, service, servers)[0]
 
     # Check for invalid utilization
-    if rho >= 1:
+    if not result.stable:
         return "Error: Utilization (ρ) must be less than 1."
 
-    # Calculate P0
-    first_term = sum([(servers * rho)**n / math.factorial(n) for n in range(servers)])
-    second_term = ((servers * rho)**servers / math.factorial(servers)) * (1 / (1 - rho))
-    P0 = 1 / (first_term + second_term)
-
-    # Calculate metrics
-    Lq = (P0 * ((servers * rho)**servers / math.factorial(servers)) * rho) / ((1 - rho)**2)
-    L = Lq + (arrival / service)
-    W = L / arrival
-    Wq = Lq / arrival
-
-    return rho, P0, Lq, L, W, Wq
+    return tuple(float(result[field]) for field in MMS_FIELDS)
 
 
 # Input fields from the user
@@ -59,7 +48,7 @@ else:
     Service = 1 / Service_mean
 
 # Input for the number of servers
-No_of_server = st.number_input('Number of servers (c)', min_value=1, max_value=50, step=1)
+No_of_server = st.number_input('Number of servers (c)', min_value=1, max_value=100000, step=1)
 
 # Calculate results
 if st.button("Calculate Metrics"):
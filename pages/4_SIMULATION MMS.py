@@ -1,19 +1,30 @@
-import math
-import pandas as pd
 import numpy as np
 import streamlit as st
 
 # Import your plotting functions from fig_func
 from modules.fig_func import (
     plot_gantt_chart,
+    gantt_window,
     entVsArrival,
     entVsService,
     entVsWT,
     entVsTA,
     calculate_server_utilization,
     ServerUtilization,
-    OverallUtilization
+    OverallUtilization,
+    long_run_controls,
+    show_long_run_summary,
+    replication_controls,
+    show_replication_summary,
+    show_timeline,
+    show_percentiles,
+    start_job,
+    show_job
 )
+from modules.sampling import poisson_cp_table
+from modules.engine import as_frame
+from modules.result_store import cached_simulation
+from modules.jobs import submit_long_run, submit_replications
 
 st.set_page_config(
     page_title="M/M/S Simulator", 
@@ -24,105 +35,31 @@ st.set_page_config(
 # Title of the Simulation
 st.title("Simulation of M/M/S Queue System")
 
-# Function to calculate cumulative probability
-
-def calculate_CP(x, lambda_rate, prev_cp):
-    if x == 0:
-        return prev_cp + math.exp(-lambda_rate)  # Base case for x = 0
-    else:
-        # Use logarithms to prevent overflow
-        log_term = x * math.log(lambda_rate) - math.log(math.factorial(x))
-        return prev_cp + math.exp(-lambda_rate + log_term)
-
-# Function to calculate service time
-def calculate_service_time(mu_rate):
-    return math.ceil(-mu_rate * np.log(np.random.rand()))
-
 # M/M/S Simulation Function
-def mmn(lambda_rate, mu_rate, num_servers):
-    service_times = []
-    cp_values = []
-    inter_arrival_times = [0]
-    arrival_times = [0]
-    turn_around_times = []
-    wait_times = []
-    response_times = []
-
-    prev_cp = 0
-    customers = []
-    num_entries = 0
-
-    # Generate cumulative probabilities until CP reaches or exceeds 1
-    max_entries = 500  # Set an upper limit to prevent overflow
-    while prev_cp < 0.9999 and num_entries < max_entries:
-        cp = calculate_CP(num_entries, lambda_rate, prev_cp)
-        cp_values.append(cp)
-        prev_cp = cp
-        service_times.append(calculate_service_time(mu_rate))
-        customers.append(num_entries)
-        num_entries += 1
-
-    cp_values.append(1)  # Ensure cumulative probability ends at 1
-    labels = [f"{cp_values[i]:.4f}-{cp_values[i+1]:.4f}" for i in range(len(cp_values) - 1)]
-
-    df = pd.DataFrame({
-        "Customer": customers,
-        "Cumulative Probability": cp_values[:-1],
-        "Service Time": service_times
-    })
-
-    # Generate inter-arrival and arrival times
-    arrival = 0
-    for i in range(num_entries - 1):
-        random = np.random.random()
-        for j in range(len(cp_values)):
-            if random < cp_values[j]:
-                inter_arrival_times.append(j)
-                arrival += j
-                arrival_times.append(arrival)
-                break
-
-    df["Inter Arrival Time"] = inter_arrival_times
-    df["Arrival Time"] = arrival_times
-
-    # Assign servers and calculate times
-    servers = [0] * num_servers
-    start_times = []
-    assigned_servers = []
-    for i in range(len(df)):
-        server = servers.index(min(servers))
-        assigned_start_time = max(df.loc[i, "Arrival Time"], servers[server])
-        servers[server] = assigned_start_time + df.loc[i, "Service Time"]
-
-        start_times.append(assigned_start_time)
-        assigned_servers.append(server)
-
-    df["Start Time"] = start_times
-    df["End Time"] = df["Start Time"] + df["Service Time"]
-    df["Server"] = assigned_servers
-
-    for i, row in df.iterrows():
-        turn_around = row["End Time"] - row["Arrival Time"]
-        wait = turn_around - row["Service Time"]
-        response = row["Start Time"] - row["Arrival Time"]
-
-        turn_around_times.append(turn_around)
-        wait_times.append(wait)
-        response_times.append(response)
-
-    df["Turn Around Time"] = turn_around_times
-    df["Wait Time"] = wait_times
-    df["Response Time"] = response_times
-
+def mmn(lambda_rate, mu_rate, num_servers, seed=None):
+    # Cumulative probabilities until CP reaches 0.9999 (cached per arrival rate, at most 500 entries)
+    cp_values = poisson_cp_table(lambda_rate)
+    num_entries = len(cp_values)
+
+    # Seeded runs are served from the result store when the same scenario was simulated before
+    columns = cached_simulation("mms", {"lambda_rate": lambda_rate, "mu_rate": mu_rate}, num_servers, num_entries, seed)
+    df = as_frame(columns)
+    df.insert(1, "Cumulative Probability", cp_values)
     return df
 
 # Inputs for Mean Arrival and Service Rates
 lembda = st.number_input("Enter the arrival rate (λ)", min_value=0.1, value=2.0, step=0.1)
 meu = st.number_input("Enter the service rate (μ)", min_value=0.1, value=3.0, step=0.1)
 servers = st.number_input("Enter the number of servers (n)", min_value=1, value=2, step=1)
+seed = st.number_input("Simulation seed", min_value=0, value=12345, step=1)
 
+# The workload stays on screen after "Generate Simulation": changing only the number of servers
+# re-dispatches the same customers (common random numbers) without sampling them again
+workload = (lembda, meu, seed)
 if st.button("Generate Simulation"):
-    df = mmn(lembda, meu, servers)
+    st.session_state["mms_workload"] = workload
+if st.session_state.get("mms_workload") == workload:
+    df = mmn(lembda, meu, servers, seed)
     if np.isclose(df['Cumulative Probability'], 1).any():
         first_index = df[np.isclose(df['Cumulative Probability'], 1)].index[0]
         df = df.iloc[:first_index]
@@ -144,8 +81,11 @@ if st.button("Generate Simulation"):
     st.write(f"**Average Wait Time**: {avg_WT:.2f}")
     st.write(f"**Average Response Time**: {avg_RT:.2f}")
 
+    st.write("### Percentiles")
+    show_percentiles(df)
+
     st.write("### Gantt Chart for Servers")
-    plot_gantt_chart(df, servers)
+    plot_gantt_chart(df, servers, window=gantt_window(df, "mms_gantt_window"))
 
     st.write("### Wait Time vs Customers")
     entVsWT(df["Customer"], df["Wait Time"])
@@ -159,11 +99,14 @@ if st.button("Generate Simulation"):
     st.write("### Service Time vs Customers")
     entVsService(df["Customer"], df["Service Time"])
 
+    st.write("### Queue Length and Server Occupancy Over Time")
+    show_timeline(df, servers)
+
     st.write("### Model Utilization")
-    server_util = calculate_server_utilization(df)
+    server_util = calculate_server_utilization(df, servers)
     # st.write("server_util = ",np.sum(list(server_util.values())))
 
-    OverallUtilization(np.sum(list(server_util.values())))
+    OverallUtilization(np.mean(list(server_util.values())))
 
 
     st.write("### Server Utilization")
@@ -171,3 +114,21 @@ if st.button("Generate Simulation"):
     for server, utilization in server_util.items():
         ServerUtilization(utilization,server_no=i)
         i+=1
+
+
+st.write("### Long-Run Simulation")
+num_customers, horizon = long_run_controls()
+if st.button("Run Long Simulation"):
+    job = submit_long_run("mms", {"lambda_rate": lembda, "mu_rate": meu}, servers,
+                          num_customers=num_customers, horizon=horizon, seed=seed)
+    start_job("mms_long_run", job)
+show_job("mms_long_run", show_long_run_summary)
+
+
+st.write("### Independent Replications")
+replications, rep_customers, seed, confidence = replication_controls()
+if st.button("Run Replications"):
+    job = submit_replications("mms", {"lambda_rate": lembda, "mu_rate": meu}, servers,
+                              replications=replications, num_customers=rep_customers, seed=seed, confidence=confidence)
+    start_job("mms_replications", job)
+show_job("mms_replications", show_replication_summary)
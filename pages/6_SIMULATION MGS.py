@@ -1,9 +1,10 @@
-import math
-import random
 import numpy as np
-import pandas as pd
 import streamlit as st
 from modules.fig_func import *
+from modules.sampling import rounded_poisson_cp_table
+from modules.engine import as_frame
+from modules.result_store import cached_simulation
+from modules.jobs import submit_long_run, submit_replications
 
 st.set_page_config(
     page_title="M/G/S Simulator", 
@@ -14,84 +15,14 @@ st.set_page_config(
 
 st.title("Simulation of M/G/S")
 
-def mgn(lembda, meuMin, meuMax, n):
-    meu = (meuMin + meuMax) / 2
-    s_no = []
-    cp = []
-    cpl = [0]
-    int_arrival = [0]
-    arrival = [0]
-    service = []
-    TA = []
-    WT = []
-    RT = []
-    server_assigned = []
-    start_times = []
-    end_times = []
-    value = 0
-
-    # Generating serial numbers and probabilities
-    x = 0
-    while cpl[-1] < 1:
-        s_no.append(x)
-        value = value + (((math.exp(-lembda)) * (lembda ** x)) / math.factorial(x))
-        cp.append(float("%.4f" % value))
-        cpl.append(cp[-1])
-        x += 1
-    cpl.pop(-1)
-
-    # Inter-arrival time generation
-    for i in range(len(cp)-1):
-        ran_var = float("%.4f" % random.uniform(0, 1))
-        for j in range(len(cp)):
-            if cpl[j] < ran_var and ran_var < cp[j]:
-                int_arrival.append(j)
-
-    # Arrival time generation
-    for i in range(1, len(cp)):
-        # st.write("i = ",i)
-        arrival.append(int_arrival[i] + arrival[i - 1])
-
-    # Service time generation
-    for i in range(len(cp)):
-        service.append(math.ceil(-meu * math.log(random.uniform(0, 1))))
-
-    
-    # st.write("service = ",len(service))
-    # st.write("arrival = ",len(arrival))
-    # st.write("int_arrival = ",len(int_arrival))
-
-    # Server assignments
-    ends = [0] * n
-    for i in range(len(cp)):
-        min_end_time_server = min(range(n), key=lambda x: ends[x])
-        start_time = max(arrival[i], ends[min_end_time_server])
-        end_time = start_time + service[i]
-        ends[min_end_time_server] = end_time
-        server_assigned.append(min_end_time_server)
-        start_times.append(start_time)
-        end_times.append(end_time)
-
-    # Calculate turnaround time, wait time, and response time
-    for i in range(len(cp)):
-        TA.append(end_times[i] - arrival[i])
-        WT.append(TA[-1] - service[i])
-        RT.append(start_times[i] - arrival[i])
-
-    # Create result DataFrame
-    result = pd.DataFrame({
-        "Customer": s_no,
-        "Cumulative Probability": cp,
-        "Inter Arrival Time": int_arrival,
-        "Arrival Time": arrival,
-        "Service Time": service,
-        "Server": server_assigned,
-        "Start Time": start_times,
-        "End Time": end_times,
-        "Turn Around Time": TA,
-        "Response Time": RT,
-        "Wait Time": WT
-    })
+def mgn(lembda, meuMin, meuMax, n, seed=None):
+    # Cumulative probabilities (cached per arrival rate); one customer per table entry
+    cp = rounded_poisson_cp_table(lembda)
+
+    # Seeded runs are served from the result store when the same scenario was simulated before
+    columns = cached_simulation("mgs", {"lembda": lembda, "meu_min": meuMin, "meu_max": meuMax}, n, len(cp), seed)
+    result = as_frame(columns)
+    result.insert(1, "Cumulative Probability", cp)
     return result
 
 
@@ -100,11 +31,16 @@ lambda_value = st.number_input("Enter the value of lambda", min_value=0.1, value
 meu_min = st.number_input("Enter the minimum value for meu", min_value=1.0, value=3.0, step=0.1)
 meu_max = st.number_input("Enter the maximum value for meu", min_value=1.0, value=5.0, step=0.1)
 num_servers = st.number_input("Enter the number of servers", min_value=1, value=1, step=1)
+seed = st.number_input("Simulation seed", min_value=0, value=12345, step=1)
 # num_entries = st.number_input("Enter the number of entries", min_value=1, value=10, step=1)
 
 # Run simulation
+# Shown again on reruns until the workload (anything but the server count) changes
+workload = (lambda_value, meu_min, meu_max, seed)
 if st.button("Generate Simulation"):
-    df = mgn(lambda_value, meu_min, meu_max, num_servers)
+    st.session_state["mgs_workload"] = workload
+if st.session_state.get("mgs_workload") == workload:
+    df = mgn(lambda_value, meu_min, meu_max, num_servers, seed)
 
     # Truncate DataFrame based on Cumulative Probability
     if (np.isclose(df['Cumulative Probability'], 1, atol=1e-4)).any():
@@ -128,8 +64,11 @@ if st.button("Generate Simulation"):
     st.write(f"**Average Wait Time**: {avg_WT:.2f}")
     st.write(f"**Average Response Time**: {avg_RT:.2f}")
 
+    st.write("### Percentiles")
+    show_percentiles(df)
+
     st.write("### Gantt Chart for Servers")
-    plot_gantt_chart(df, num_servers)
+    plot_gantt_chart(df, num_servers, window=gantt_window(df, "mgs_gantt_window"))
 
     st.write("### Wait Time vs Customers")
     entVsWT(df["Customer"], df["Wait Time"])
@@ -144,9 +83,12 @@ if st.button("Generate Simulation"):
     entVsService(df["Customer"], df["Service Time"])
 
 
+    st.write("### Queue Length and Server Occupancy Over Time")
+    show_timeline(df, num_servers)
+
     st.write("### Model Utilization")
-    server_util = calculate_server_utilization(df)
-    OverallUtilization(np.sum(list(server_util.values())))
+    server_util = calculate_server_utilization(df, num_servers)
+    OverallUtilization(np.mean(list(server_util.values())))
 
     st.write("### Server Utilization")
     i=1
@@ -155,6 +97,19 @@ if st.button("Generate Simulation"):
         i+=1
 
 
-    
+st.write("### Long-Run Simulation")
+num_customers, horizon = long_run_controls()
+if st.button("Run Long Simulation"):
+    job = submit_long_run("mgs", {"lembda": lambda_value, "meu_min": meu_min, "meu_max": meu_max}, num_servers,
+                          num_customers=num_customers, horizon=horizon, seed=seed)
+    start_job("mgs_long_run", job)
+show_job("mgs_long_run", show_long_run_summary)
+
 
-    
\ No newline at end of file
+st.write("### Independent Replications")
+replications, rep_customers, seed, confidence = replication_controls()
+if st.button("Run Replications"):
+    job = submit_replications("mgs", {"lembda": lambda_value, "meu_min": meu_min, "meu_max": meu_max}, num_servers,
+                              replications=replications, num_customers=rep_customers, seed=seed, confidence=confidence)
+    start_job("mgs_replications", job)
+show_job("mgs_replications", show_replication_summary)
@@ -0,0 +1,79 @@
+import numpy as np
+import streamlit as st
+from modules.queuing import erlang_c, ggs_metrics, mms_metrics
+from modules.staffing import min_servers
+
+
+st.set_page_config(
+    page_title="Staffing Optimizer",
+    page_icon="./data/simulation.png",
+    layout="centered",
+    initial_sidebar_state="auto"
+)
+
+st.title("Staffing Optimizer")
+st.write("Find the minimum number of servers that meets a waiting-time target for each period of demand.")
+
+# Input fields from the user
+model = st.radio("Queuing model", ("M/M/S", "G/G/S"), horizontal=True)
+demand_text = st.text_area("Arrival rate (λ) for each period, separated by commas", value="20, 35, 50, 42, 30")
+service_rate = st.number_input("Service rate (μ) of one server", min_value=0.01, step=0.1, value=5.0, format="%.2f")
+if model == "G/G/S":
+    arrival_cv2 = st.number_input("Arrival variability (Ca² = variance / mean²)", min_value=0.0, step=0.1, value=1.0)
+    service_cv2 = st.number_input("Service variability (Cs² = variance / mean²)", min_value=0.0, step=0.1, value=1.0)
+
+target_type = st.radio("Target", ("Wait in queue (Wq) ≤ T", "Probability of waiting ≤ p"), horizontal=True)
+if target_type.startswith("Wait"):
+    target = "wait"
+    limit = st.number_input("Maximum average wait in queue (T, in the time unit of λ)", min_value=0.0,
+                            step=0.01, value=0.05, format="%.4f")
+else:
+    target = "probability"
+    limit = st.number_input("Maximum probability of waiting (p)", min_value=0.0, max_value=1.0, step=0.01, value=0.2)
+    if model == "G/G/S":
+        st.info("The probability of waiting is the M/M/S (Erlang C) value: Ca² and Cs² only adjust the wait in queue, "
+                "so this target ignores them.")
+max_servers = st.number_input("Largest number of servers to consider", min_value=1, max_value=1000000, value=100000, step=1)
+
+# Calculate results
+if st.button("Find Minimum Servers"):
+    try:
+        demand = np.array([float(value) for value in demand_text.replace("\n", ",").split(",") if value.strip()])
+    except ValueError:
+        demand = np.array([])
+    if demand.size == 0 or (demand <= 0).any():
+        st.error("Please enter one or more positive arrival rates, separated by commas.")
+    elif limit <= 0:
+        st.error("Please enter a target greater than 0: no finite number of servers brings it down to 0.")
+    else:
+        if model == "M/M/S":
+            params = {"arrival_rate": demand, "service_rate": service_rate}
+            servers = min_servers("mms", target, limit, max_servers=max_servers, **params)
+            metrics = mms_metrics(demand, service_rate, np.maximum(servers, 1))
+        else:
+            params = {
+                "arrival_mean": 1 / demand,
+                "service_mean": 1 / service_rate,
+                "arrival_variance": arrival_cv2 / demand ** 2,
+                "service_variance": service_cv2 / service_rate ** 2,
+            }
+            servers = min_servers("ggs", target, limit, max_servers=max_servers, **params)
+            metrics = ggs_metrics(params["arrival_mean"], params["service_mean"], np.maximum(servers, 1),
+                                  params["arrival_variance"], params["service_variance"])
+
+        reachable = servers > 0
+        offered = demand / service_rate
+        with np.errstate(divide="ignore", invalid="ignore"):
+            wait_probability = np.where(reachable, erlang_c(offered, np.maximum(servers, 1)), np.nan)
+
+        st.subheader("Results:")
+        st.dataframe({
+            "Period": np.arange(1, demand.size + 1),
+            "Arrival Rate (λ)": demand,
+            "Minimum Servers": np.where(reachable, servers, 0),
+            "Utilization (ρ)": np.where(reachable, offered / np.maximum(servers, 1), np.nan),
+            "Wait in Queue (Wq)": np.where(reachable, metrics.Wq, np.nan),
+            "P(wait)": wait_probability,
+        }, hide_index=True)
+        if not reachable.all():
+            st.warning("Periods with 0 servers cannot meet the target within the largest number of servers considered.")
@@ -0,0 +1,21 @@
+import pytest
+from modules.batch import load_scenarios, run_scenario, scenario_arguments
+
+
+def write_scenarios(tmp_path, rows):
+    path = tmp_path / "scenarios.csv"
+    path.write_text("model,servers,customers,lambda_rate,mu_rate\n" + "".join(row + "\n" for row in rows))
+    return str(path)
+
+
+@pytest.mark.parametrize("row, column", [("mms,2,0,1,1", "customers"), ("mms,0,100,1,1", "servers"),
+                                         ("mms,2,1.5,1,1", "customers")])
+def test_load_scenarios_rejects_empty_runs(tmp_path, row, column):
+    with pytest.raises(ValueError, match=f"Scenario 1 .*{column}"):
+        load_scenarios(write_scenarios(tmp_path, ["mms,2,100,1,1", row]))
+
+
+def test_single_customer_scenario_runs(tmp_path):
+    scenarios = load_scenarios(write_scenarios(tmp_path, ["mms,2,1,1,1"]))
+    summary, _ = run_scenario(*scenario_arguments(scenarios.iloc[0], 0))
+    assert summary["Average Wait Time"] == 0.0
@@ -0,0 +1,22 @@
+import os
+import pandas as pd
+import pytest
+from modules.dataset import DATA_PATH, FRAMES, load_bank_data
+
+pytestmark = pytest.mark.skipif(not os.path.exists(DATA_PATH), reason="bank workbook not available")
+
+
+@pytest.mark.parametrize("broken", ["customers.parquet", "meta.json"])
+@pytest.mark.parametrize("content", [b"", b"PAR1 partial"])
+def test_unreadable_cache_is_parsed_again_and_rewritten(tmp_path, broken, content):
+    expected = load_bank_data(cache_dir=tmp_path)
+    (tmp_path / broken).write_bytes(content)
+
+    frames = load_bank_data(cache_dir=tmp_path)
+    for name in FRAMES:
+        pd.testing.assert_frame_equal(frames[name], expected[name])
+
+    # The cache is whole again and is read back without parsing the workbook
+    repaired = load_bank_data(cache_dir=tmp_path)
+    pd.testing.assert_frame_equal(repaired["customers"], expected["customers"])
+    assert not [path.name for path in tmp_path.iterdir() if path.name.endswith(".tmp")]
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+from modules.dispatch import dispatch, lindley, queue_metrics, server_heap
+
+
+# Reference single-server loop: each customer starts when they arrive or when the previous one leaves
+def reference_lindley(arrival, service, free_time=0):
+    start = np.empty(len(arrival))
+    for i, (arrival_time, service_time) in enumerate(zip(arrival, service)):
+        start[i] = max(arrival_time, free_time)
+        free_time = start[i] + service_time
+    return start, start + service
+
+
+def float_customers(count, seed=1):
+    rng = np.random.default_rng(seed)
+    return np.cumsum(rng.exponential(1.0, count)), rng.exponential(0.9, count)
+
+
+def test_lindley_matches_loop_on_float_times():
+    arrival, service = float_customers(200_000)
+    start, end = lindley(arrival, service)
+    expected_start, expected_end = reference_lindley(arrival, service)
+    np.testing.assert_allclose(start, expected_start, rtol=0, atol=1e-8)
+    np.testing.assert_allclose(end, expected_end, rtol=0, atol=1e-8)
+
+
+def test_lindley_never_starts_before_arrival_or_overlaps():
+    arrival, service = float_customers(200_000)
+    start, end = lindley(arrival, service)
+    _, wait, _ = queue_metrics(arrival, service, start, end)
+    assert wait.min() >= 0
+    assert (start[1:] >= end[:-1]).all()
+    assert (end >= start).all()
+
+
+def test_lindley_is_exact_on_integer_times():
+    rng = np.random.default_rng(2)
+    arrival, service = np.cumsum(rng.integers(0, 5, 10_000)), rng.integers(1, 5, 10_000)
+    start, end = lindley(arrival, service)
+    expected_start, expected_end = reference_lindley(arrival, service)
+    assert start.dtype == np.int64
+    np.testing.assert_array_equal(start, expected_start)
+    np.testing.assert_array_equal(end, expected_end)
+
+
+@pytest.mark.parametrize("num_servers", [1, 3])
+def test_chunked_dispatch_matches_one_batch(num_servers):
+    arrival, service = float_customers(50_000, seed=3)
+    server, start, end = dispatch(arrival, service, num_servers)
+
+    heap = server_heap(num_servers)
+    chunks = [dispatch(arrival[i:i + 7_000], service[i:i + 7_000], num_servers, heap=heap)
+              for i in range(0, len(arrival), 7_000)]
+    np.testing.assert_array_equal(np.concatenate([chunk[0] for chunk in chunks]), server)
+    np.testing.assert_allclose(np.concatenate([chunk[1] for chunk in chunks]), start, rtol=0, atol=1e-8)
+    np.testing.assert_allclose(np.concatenate([chunk[2] for chunk in chunks]), end, rtol=0, atol=1e-8)
+    assert (np.concatenate([chunk[1] for chunk in chunks]) >= arrival).all()
+
+
+# Reference multi-server scan of the original simulators: the earliest free server, lowest number on ties
+def reference_scan(arrival, service, num_servers):
+    free = [0] * num_servers
+    servers, starts = [], []
+    for arrival_time, service_time in zip(arrival.tolist(), service.tolist()):
+        server = free.index(min(free))
+        start = max(arrival_time, free[server])
+        free[server] = start + service_time
+        servers.append(server)
+        starts.append(start)
+    return np.array(servers), np.array(starts)
+
+
+@pytest.mark.parametrize("num_servers", [1, 2, 3, 7])
+def test_dispatch_matches_original_scan_on_whole_minutes(num_servers):
+    rng = np.random.default_rng(num_servers)
+    arrival = np.cumsum(rng.integers(0, 4, 5_000))
+    service = rng.integers(1, 4 * num_servers, 5_000)
+    server, start, end = dispatch(arrival, service, num_servers)
+    expected_server, expected_start = reference_scan(arrival, service, num_servers)
+    np.testing.assert_array_equal(server, expected_server)
+    np.testing.assert_array_equal(start, expected_start)
+    np.testing.assert_array_equal(end, expected_start + service)
+
+
+def test_dispatch_matches_original_scan_on_float_times():
+    arrival, service = float_customers(20_000, seed=4)
+    server, start, _ = dispatch(arrival, 2.5 * service, 3)
+    expected_server, expected_start = reference_scan(arrival, 2.5 * service, 3)
+    np.testing.assert_array_equal(server, expected_server)
+    np.testing.assert_array_equal(start, expected_start)
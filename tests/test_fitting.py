@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from modules.fitting import Histogram, best_fit, fit_distribution, histogram
+
+
+# Counts of the histogram spread back onto every fixed-width bin up to the last non-empty one
+def dense_counts(hist):
+    counts = np.zeros(int(hist.bins[-1]) + 1, dtype=np.int64)
+    counts[hist.bins] = hist.bin_counts
+    return counts
+
+
+@pytest.mark.parametrize("bin_width", [1.0, 0.5, 2.5])
+def test_histogram_matches_numpy(bin_width):
+    values = np.random.default_rng(1).exponential(4.0, 50_000)
+    hist = histogram(values, bin_width)
+    last = (int(values.max() // bin_width) + 1) * bin_width
+    expected, _ = np.histogram(values, np.arange(0, last + bin_width / 2, bin_width))
+    np.testing.assert_array_equal(dense_counts(hist), expected)
+    assert hist.stats.count == values.size
+    assert hist.stats.mean == pytest.approx(values.mean(), rel=1e-12)
+
+
+def test_chunks_and_merges_match_one_histogram():
+    values = np.random.default_rng(2).normal(20.0, 4.0, 30_000).clip(0)
+    whole = histogram(values)
+    chunked, merged = Histogram(), Histogram()
+    for chunk in np.array_split(values, 7):
+        chunked.update(chunk)
+        merged.merge(histogram(chunk))
+    for hist in (chunked, merged):
+        np.testing.assert_array_equal(hist.bins, whole.bins)
+        np.testing.assert_array_equal(hist.bin_counts, whole.bin_counts)
+        assert hist.stats.std == pytest.approx(whole.stats.std, rel=1e-9)
+        assert (hist.minimum, hist.maximum) == (whole.minimum, whole.maximum)
+
+
+def test_outlier_does_not_allocate_bins_up_to_it():
+    hist = histogram(np.r_[np.arange(100.0), 1e8])
+    assert len(hist.counts) == 102
+    assert hist.edges[-2:].tolist() == [1e8, 1e8 + 1]
+    assert hist.counts[-2:].tolist() == [0, 1]  # The gap up to the outlier is one empty bin
+
+
+def test_gaps_keep_edges_and_counts_consistent():
+    hist = histogram([0.5, 3.2, 3.7, 9.0], bin_width=1.0)
+    assert hist.edges.tolist() == [0, 1, 3, 4, 9, 10]
+    assert hist.counts.tolist() == [1, 0, 2, 0, 1]
+    assert hist.counts.sum() == hist.stats.count
+
+
+def test_mismatched_bin_widths_cannot_be_merged():
+    with pytest.raises(ValueError):
+        Histogram(1.0).merge(Histogram(2.0))
+
+
+def test_negative_values_are_rejected():
+    with pytest.raises(ValueError):
+        histogram([1.0, -0.5])
+
+
+def test_empty_histogram_cannot_be_fitted():
+    with pytest.raises(ValueError):
+        best_fit(histogram([np.nan]))
+
+
+@pytest.mark.parametrize("name, values", [
+    ("Exponential", np.random.default_rng(3).exponential(6.0, 20_000)),
+    ("Normal", np.random.default_rng(4).normal(40.0, 5.0, 20_000)),
+    ("Uniform", np.random.default_rng(5).uniform(10.0, 30.0, 20_000)),
+    ("Poisson", np.random.default_rng(6).poisson(3.0, 20_000).astype(float)),
+])
+def test_best_fit_ranks_the_generating_distribution_first(name, values):
+    fits = best_fit(histogram(values))
+    assert fits[0]["Distribution"] == name
+    assert fits[0]["Chi-Square p-value"] > 0.001
+
+
+def test_fit_counts_every_value_across_a_gap():
+    values = np.random.default_rng(7).exponential(3.0, 5_000)
+    values = np.where((values >= 10) & (values < 12), values + 2, values)  # Leave bins 10 and 11 empty
+    fit = fit_distribution(histogram(values), "Exponential")
+    assert fit["Table"]["OBS. FREQ"].sum() == values.size
+    assert fit["Table"]["UBP"][-1] == 1.0
+    assert 0 <= fit["KS"] <= 1
@@ -0,0 +1,34 @@
+import threading
+from modules.lru import LRUCache
+
+
+def test_least_recently_used_is_dropped_first():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c"), len(cache)) == (1, 3, 2)
+
+
+def test_concurrent_gets_and_puts_never_fail():
+    cache = LRUCache(4)
+    errors = []
+
+    def work(offset):
+        try:
+            for i in range(20_000):
+                key = (i + offset) % 8
+                if cache.get(key) is None:
+                    cache.put(key, key)
+        except Exception as error:  # A KeyError here is the race being tested for
+            errors.append(error)
+
+    threads = [threading.Thread(target=work, args=(offset,)) for offset in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(cache) == 4
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from modules.quantiles import QuantileSketch, exact_percentiles
+
+FRACTIONS = np.array([0.0, 0.01, 0.25, 0.5, 0.9, 0.95, 0.99, 0.999, 1.0])
+
+
+def sketch_of(values, relative_accuracy=0.01):
+    sketch = QuantileSketch(relative_accuracy)
+    sketch.update(values)
+    return sketch
+
+
+@pytest.mark.parametrize("relative_accuracy", [0.01, 0.05])
+def test_quantiles_are_within_the_relative_accuracy(relative_accuracy):
+    values = np.random.default_rng(1).lognormal(0, 2, 100_000)
+    expected = np.quantile(values, FRACTIONS, method="lower")
+    quantiles = sketch_of(values, relative_accuracy).quantiles(FRACTIONS)
+    assert np.all(np.abs(quantiles - expected) <= relative_accuracy * expected * (1 + 1e-12))
+
+
+def test_merge_is_associative_and_matches_one_sketch():
+    rng = np.random.default_rng(2)
+    parts = [rng.exponential(scale, 20_000) for scale in (0.01, 1.0, 500.0)]
+    left, right = sketch_of(parts[0]), sketch_of(parts[1])
+    left.merge(right)
+    left.merge(sketch_of(parts[2]))
+    tail = sketch_of(parts[1])
+    tail.merge(sketch_of(parts[2]))
+    first = sketch_of(parts[0])
+    first.merge(tail)
+    whole = sketch_of(np.concatenate(parts))
+
+    for sketch in (left, first):
+        assert sketch.count == whole.count
+        assert sketch.offset == whole.offset
+        np.testing.assert_array_equal(sketch.counts, whole.counts)
+
+
+def test_zeros_are_counted_in_the_zero_bucket():
+    values = np.r_[np.zeros(600), np.arange(1, 401) * 1.5]
+    sketch = sketch_of(values)
+    assert sketch.zero_count == 600
+    assert sketch.count == 1000
+    assert sketch.quantiles([0.5])[0] == 0.0
+    assert sketch.quantiles([0.7])[0] > 0
+
+
+def test_whole_numbers_give_exact_small_percentiles():
+    values = np.random.default_rng(3).integers(0, 40, 50_000)
+    sketch = sketch_of(values)
+    expected = np.percentile(values, [50, 95, 99], method="lower")
+    assert list(sketch.percentiles().values()) == expected.tolist()
+    assert sketch.integer_valued
+
+
+def test_fractional_values_are_not_rounded():
+    sketch = sketch_of([0.25, 0.5, 0.75])
+    assert not sketch.integer_valued
+    assert sketch.quantiles([0.5])[0] == pytest.approx(0.5, rel=0.01)
+
+
+def test_negative_values_are_rejected():
+    with pytest.raises(ValueError):
+        sketch_of([1.0, -1e-12])
+
+
+def test_exact_percentiles_of_no_values_are_nan():
+    assert all(np.isnan(value) for value in exact_percentiles([]).values())
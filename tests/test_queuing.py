@@ -0,0 +1,44 @@
+import math
+import numpy as np
+import pytest
+from modules.queuing import erlang_b, ggs_metrics, mgs_metrics, mms_metrics
+
+
+# P0 of M/M/c from the textbook sum, for small c where a**n / n! is exact enough
+def textbook_p0(a, c):
+    rho = a / c
+    terms = sum(a ** n / math.factorial(n) for n in range(c))
+    return 1 / (terms + a ** c / math.factorial(c) / (1 - rho))
+
+
+@pytest.mark.parametrize("arrival, service, servers", [(2, 1, 3), (9, 1, 10), (30, 1, 40), (0.5, 1, 1)])
+def test_mms_p0_matches_textbook_formula(arrival, service, servers):
+    result = mms_metrics(arrival, service, servers)[0]
+    assert result.P0 == pytest.approx(textbook_p0(arrival / service, servers), rel=1e-9)
+
+
+# With a << c almost no customer waits, so P0 tends to the Poisson probability e**-a of an empty system
+@pytest.mark.parametrize("arrival, servers", [(1, 200), (10, 500), (1, 100000)])
+def test_mms_p0_with_many_idle_servers(arrival, servers):
+    result = mms_metrics(arrival, 1, servers)[0]
+    assert result.P0 == pytest.approx(math.exp(-arrival), rel=1e-9)
+    assert result.Lq == pytest.approx(0.0, abs=1e-12)
+
+
+def test_mgs_and_ggs_p0_with_many_idle_servers():
+    assert mgs_metrics(1, 300, 1, 0.5)[0].P0 == pytest.approx(math.exp(-1), rel=1e-9)
+    assert ggs_metrics(1, 1, 300, 1, 1)[0].P0 == pytest.approx(math.exp(-1), rel=1e-9)
+
+
+def test_mms_lq_matches_erlang_b_at_large_c():
+    a, c = 49000, 50000
+    rho = a / c
+    b = erlang_b(a, c)
+    expected = rho / (1 - rho) ** 2 / (1 / b - 1 + 1 / (1 - rho))
+    assert mms_metrics(a, 1, c)[0].Lq == pytest.approx(expected, rel=1e-6)
+
+
+def test_unstable_scenarios_are_masked():
+    result = mms_metrics([1, 3], 1, [2, 2])
+    assert list(result.stable) == [True, False]
+    assert np.isnan(result.P0[1])
@@ -0,0 +1,58 @@
+import os
+import threading
+import numpy as np
+import pytest
+from modules.result_store import cached_simulation, load_result, prune_results, save_result
+
+
+@pytest.mark.parametrize("content", [b"", b"PK\x03\x04not a zip", None])
+def test_unreadable_result_is_a_miss_and_is_removed(tmp_path, content):
+    save_result("key", {"values": np.arange(1000)}, tmp_path)
+    path = tmp_path / "key.npz"
+    path.write_bytes(path.read_bytes()[:60] if content is None else content)
+
+    assert load_result("key", tmp_path) is None
+    assert not path.exists()
+
+
+def test_concurrent_saves_do_not_mix(tmp_path):
+    threads = [
+        threading.Thread(target=save_result, args=("key", {"values": np.full(100_000, i)}, tmp_path))
+        for i in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    values = load_result("key", tmp_path)["values"]
+    assert len(np.unique(values)) == 1
+    assert [path.name for path in tmp_path.iterdir()] == ["key.npz"]
+
+
+def test_store_is_pruned_least_recently_used_first(tmp_path):
+    columns = {"values": np.arange(10_000)}
+    for index, key in enumerate(["old", "used", "new"]):
+        save_result(key, columns, tmp_path)
+        os.utime(tmp_path / f"{key}.npz", (1000 + index, 1000 + index))
+    entry_size = (tmp_path / "old.npz").stat().st_size
+    assert load_result("old", tmp_path) is not None  # A hit makes "old" the most recently used
+
+    save_result("latest", columns, tmp_path, max_bytes=3 * entry_size)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["latest.npz", "new.npz", "old.npz"]
+
+
+def test_stale_temporary_files_are_pruned(tmp_path):
+    (tmp_path / "dead.npz.123.tmp").write_bytes(b"partial")
+    os.utime(tmp_path / "dead.npz.123.tmp", (0, 0))
+    prune_results(tmp_path)
+    assert not (tmp_path / "dead.npz.123.tmp").exists()
+
+
+def test_simulation_without_a_cache_dir_stays_off_the_disk(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    params = {"lambda_rate": 1.0, "mu_rate": 1.5}
+    columns = cached_simulation("mms", params, 2, 500, seed=4, cache_dir=None)
+    assert list(tmp_path.iterdir()) == []
+    stored = cached_simulation("mms", params, 2, 500, seed=4, cache_dir=tmp_path / "store")
+    np.testing.assert_array_equal(columns["End Time"], stored["End Time"])
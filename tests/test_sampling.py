@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from modules.sampling import alias_table, empirical_alias_table, sample_alias, sample_empirical
+
+
+# Function to read back the probability of every outcome that an alias table encodes
+def implied_probabilities(prob, alias):
+    implied = prob.copy()
+    np.add.at(implied, alias, 1 - prob)
+    return implied / len(prob)
+
+
+@pytest.mark.parametrize("weights", [
+    [1, 1, 1, 1],
+    [5, 0, 1, 3, 0, 11],
+    [1e-9, 1, 1e9],
+    np.random.default_rng(1).random(1000),
+    [7],
+])
+def test_alias_table_reproduces_the_weights(weights):
+    weights = np.asarray(weights, dtype=float)
+    prob, alias = alias_table(weights)
+    assert ((prob >= 0) & (prob <= 1)).all()
+    np.testing.assert_allclose(implied_probabilities(prob, alias), weights / weights.sum(), rtol=1e-9, atol=1e-15)
+
+
+def test_zero_weights_are_never_drawn():
+    prob, alias = alias_table([0, 2, 0, 1])
+    draws = sample_alias(prob, alias, 100_000, np.random.default_rng(2))
+    assert set(np.unique(draws)) == {1, 3}
+
+
+def test_empirical_draws_follow_the_observed_frequencies():
+    observed = np.repeat([0, 1, 2, 5, 9], [50, 25, 12, 8, 5])
+    table = empirical_alias_table(observed)
+    draws = sample_empirical(table, 400_000, np.random.default_rng(3))
+    values, counts = np.unique(draws, return_counts=True)
+    assert values.tolist() == [0, 1, 2, 5, 9]
+    np.testing.assert_allclose(counts / draws.size, [0.50, 0.25, 0.12, 0.08, 0.05], atol=0.004)
+
+
+def test_empirical_draws_are_reproducible_with_a_seed():
+    table = empirical_alias_table([3, 1, 4, 1, 5, 9, 2, 6])
+    first = sample_empirical(table, 1_000, np.random.default_rng(4))
+    second = sample_empirical(table, 1_000, np.random.default_rng(4))
+    np.testing.assert_array_equal(first, second)
+
+
+@pytest.mark.parametrize("weights", [[], [0, 0], [1, -1]])
+def test_invalid_weights_are_rejected(weights):
+    with pytest.raises(ValueError):
+        alias_table(weights)
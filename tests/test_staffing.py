@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+from modules.queuing import erlang_c, ggs_metrics, mms_metrics
+from modules.staffing import min_servers
+
+ARRIVAL_RATES = np.array([0.5, 2.0, 7.5, 20.0, 49.0, 120.0])
+SERVICE_RATE = 1.0
+
+
+# Function to find the minimum number of servers by trying every count in turn
+def brute_force(metric, limit, max_servers=400):
+    found = []
+    for rate in ARRIVAL_RATES:
+        servers = np.arange(1, max_servers + 1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = metric(rate, servers)
+        meets = np.flatnonzero(values <= limit)
+        found.append(servers[meets[0]] if meets.size else -1)
+    return np.array(found)
+
+
+@pytest.mark.parametrize("limit", [0.5, 0.05, 0.001])
+def test_mms_wait_matches_brute_force(limit):
+    expected = brute_force(lambda rate, c: mms_metrics(rate, SERVICE_RATE, c).Wq, limit)
+    found = min_servers("mms", "wait", limit, arrival_rate=ARRIVAL_RATES, service_rate=SERVICE_RATE)
+    np.testing.assert_array_equal(found, expected)
+
+
+@pytest.mark.parametrize("limit", [0.5, 0.2, 0.01])
+def test_mms_probability_matches_brute_force(limit):
+    def probability(rate, c):
+        return np.where(rate / SERVICE_RATE < c, erlang_c(rate / SERVICE_RATE, c), np.nan)
+
+    expected = brute_force(probability, limit)
+    found = min_servers("mms", "probability", limit, arrival_rate=ARRIVAL_RATES, service_rate=SERVICE_RATE)
+    np.testing.assert_array_equal(found, expected)
+
+
+@pytest.mark.parametrize("cv2", [0.25, 1.0, 3.0])
+def test_ggs_wait_matches_brute_force(cv2):
+    params = {
+        "arrival_mean": 1 / ARRIVAL_RATES,
+        "service_mean": 1 / SERVICE_RATE,
+        "arrival_variance": cv2 / ARRIVAL_RATES ** 2,
+        "service_variance": cv2 / SERVICE_RATE ** 2,
+    }
+
+    def wait(rate, c):
+        return ggs_metrics(1 / rate, 1 / SERVICE_RATE, c, cv2 / rate ** 2, cv2 / SERVICE_RATE ** 2).Wq
+
+    expected = brute_force(wait, 0.05)
+    np.testing.assert_array_equal(min_servers("ggs", "wait", 0.05, **params), expected)
+
+
+def test_unreachable_target_gives_minus_one():
+    found = min_servers("mms", "wait", 1e-6, max_servers=25, arrival_rate=[2.0, 30.0], service_rate=1.0)
+    assert found[1] == -1
+
+
+@pytest.mark.parametrize("target", ["wait", "probability"])
+def test_target_of_zero_is_rejected(target):
+    with pytest.raises(ValueError):
+        min_servers("mms", target, 0.0, arrival_rate=2.0, service_rate=1.0)
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from modules.engine import simulate
+from modules.timeline import occupancy_timeline, step_aggregates, time_average, time_weighted_metrics
+
+
+@pytest.fixture(params=[("mms", {"lambda_rate": 1.0, "mu_rate": 1.5}, 2), ("mgs", {"lembda": 2.0, "meu_min": 3.0, "meu_max": 5.0}, 3)])
+def run(request):
+    model, params, num_servers = request.param
+    return simulate(model, params, num_servers, 5_000, np.random.default_rng(7)), num_servers
+
+
+# Little's law over a horizon that starts and ends with an empty system: the time-weighted number in the
+# system (or queue) equals the total time customers spent there divided by the horizon
+def test_l_and_lq_match_total_time_over_horizon(run):
+    columns, num_servers = run
+    horizon = float(columns["End Time"].max())
+    metrics = time_weighted_metrics(columns, num_servers)
+    assert metrics["L"] == pytest.approx(columns["Turn Around Time"].sum() / horizon, rel=1e-12)
+    assert metrics["Lq"] == pytest.approx(columns["Wait Time"].sum() / horizon, rel=1e-12)
+    assert metrics["Busy Servers"] == pytest.approx(columns["Service Time"].sum() / horizon, rel=1e-12)
+    assert metrics["Overall Utilization"] == pytest.approx(metrics["Busy Servers"] / num_servers, rel=1e-12)
+
+
+def test_timeline_stays_within_bounds(run):
+    columns, num_servers = run
+    times, in_system, queue, busy = occupancy_timeline(columns["Arrival Time"], columns["Start Time"], columns["End Time"])
+    assert (np.diff(times) > 0).all()
+    assert (queue >= 0).all() and (busy >= 0).all() and (busy <= num_servers).all()
+    assert (in_system == queue + busy).all()
+    assert in_system[-1] == 0
+
+
+def test_simultaneous_events_are_applied_together():
+    times, in_system, queue, busy = occupancy_timeline([0, 0, 2], [0, 1, 2], [1, 2, 3])
+    assert times.tolist() == [0, 1, 2, 3]
+    assert in_system.tolist() == [2, 1, 1, 0]
+    assert queue.tolist() == [1, 0, 0, 0]
+    assert busy.tolist() == [1, 1, 1, 0]
+
+
+def test_step_aggregates_keep_the_time_weighted_mean(run):
+    columns, _ = run
+    times, in_system, _, _ = occupancy_timeline(columns["Arrival Time"], columns["Start Time"], columns["End Time"])
+    edges, low, high, mean = step_aggregates(times, in_system, 50)
+    assert (low <= mean + 1e-9).all() and (mean <= high + 1e-9).all()
+    overall = np.dot(mean, np.diff(edges)) / (edges[-1] - edges[0])
+    assert overall == pytest.approx(time_average(times, in_system), rel=1e-9)